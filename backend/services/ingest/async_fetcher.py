@@ -0,0 +1,231 @@
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from services.ingest import config
+from services.ingest.github_session import (
+    GITHUB_API_URL,
+    GITHUB_GRAPHQL_URL,
+    count_from_links,
+    get_http_cache,
+    get_scheduler,
+    links_from_header,
+)
+from services.ingest.rate_limiter import resource_for_url
+from services.ingest.repo_fetcher import (
+    REPO_SNAPSHOT_QUERY,
+    build_snippet,
+    cached_user_profiles,
+    contributor_details,
+    parse_repo_snapshot,
+    readme_snippet,
+    remember_user_profiles,
+    select_snippet_files,
+    snapshot_since_date,
+    user_profile_query,
+)
+
+
+class AsyncGitHubClient:
+    """
+    asyncio counterpart of the fetch_* functions in repo_fetcher, returning the same shapes.
+    One client owns one aiohttp connection pool (bounded per host) and shares the
+    process-wide rate-limit scheduler, the conditional-request (ETag) cache and the user
+    profile cache with the blocking fetchers, so thousands of requests can be in flight
+    from a single event loop without overrunning GitHub or re-downloading unchanged data.
+
+        async with AsyncGitHubClient() as gh:
+            repo_data, snippets = await asyncio.gather(
+                gh.fetch_repo_data(owner, repo), gh.fetch_code_snippets(owner, repo)
+            )
+    """
+
+    def __init__(self, max_connections=None, max_per_host=None):
+        self.max_connections = max_connections or config.GITHUB_ASYNC_MAX_CONNECTIONS
+        self.max_per_host = max_per_host or config.GITHUB_ASYNC_MAX_PER_HOST
+        self._session = None
+        self._scheduler = get_scheduler()
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(sock_connect=config.GITHUB_CONNECT_TIMEOUT, sock_read=config.GITHUB_READ_TIMEOUT),
+            headers={"Accept": "application/vnd.github+json", "User-Agent": "oss-discoverability-ingest"},
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, url, params=None, payload=None, headers=None):
+        """Send one request through the shared rate-limit scheduler; returns (status, headers, body bytes, url)."""
+        resource = resource_for_url(url)
+        attempt = 0
+        while True:
+            token, wait = self._scheduler.reserve(resource)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            request_headers = dict(headers or {})
+            if token:
+                request_headers["Authorization"] = f"Bearer {token}"
+            async with self._session.request(method, url, params=params, json=payload, headers=request_headers) as resp:
+                body = await resp.read()
+                status, resp_headers, final_url = resp.status, resp.headers, str(resp.url)
+            self._scheduler.record(token, resource, resp_headers)
+            limited = self._scheduler.is_rate_limited(status, resp_headers, body.decode("utf-8", errors="ignore"))
+            if not limited or attempt >= config.GITHUB_MAX_RETRIES:
+                return status, resp_headers, body, final_url
+            self._scheduler.back_off(token, resource, status, resp_headers, attempt)
+            attempt += 1
+
+    async def _get(self, path_or_url, params=None, headers=None):
+        """GET like github_get: revalidated against the shared ETag cache. Returns (status, headers, body bytes)."""
+        url = path_or_url if path_or_url.startswith("http") else f"{GITHUB_API_URL}/{path_or_url.lstrip('/')}"
+        cache = get_http_cache()
+        if cache is None:
+            status, resp_headers, body, _ = await self._request("GET", url, params=params, headers=headers)
+            return status, resp_headers, body
+
+        key = cache.make_key(url, params, (headers or {}).get("Accept"))
+        entry = cache.lookup(key)
+        request_headers = dict(headers or {})
+        if entry:
+            request_headers.update(cache.validators(entry))
+
+        status, resp_headers, body, final_url = await self._request("GET", url, params=params, headers=request_headers)
+        if status == 304 and entry:
+            return 200, cache.revalidate(key, entry, resp_headers), entry["body"]
+        cache.record_miss()
+        cache.store_raw(key, status, resp_headers, body, final_url)
+        return status, resp_headers, body
+
+    async def _get_json(self, url, params=None, headers=None):
+        status, _, body = await self._get(url, params=params, headers=headers)
+        if status != 200:
+            print(f"GET {url} failed: {status} - {body[:200]!r}", flush=True)
+            return None
+        return json.loads(body)
+
+    async def run_graphql_query_partial(self, query, variables):
+        status, _, body, _ = await self._request(
+            "POST", GITHUB_GRAPHQL_URL, payload={"query": query, "variables": variables},
+            headers={"Accept": "application/json"},
+        )
+        if status != 200:
+            raise aiohttp.ClientError(f"GraphQL request failed: {status} - {body[:200]!r}")
+        data = json.loads(body)
+        return data.get("data") or {}, data.get("errors") or []
+
+    async def run_graphql_query(self, query, variables):
+        data, errors = await self.run_graphql_query_partial(query, variables)
+        if errors:
+            raise aiohttp.ClientError(f"GraphQL errors: {errors}")
+        return data
+
+    async def _paginate(self, url, params, per_page, max_items):
+        items = []
+        page = 1
+        while len(items) < max_items:
+            page_params = dict(params, per_page=min(per_page, max_items - len(items)), page=page)
+            data = await self._get_json(url, params=page_params)
+            if not data:
+                break
+            items.extend(data)
+            if len(data) < page_params["per_page"]:
+                break
+            page += 1
+        return items[:max_items]
+
+    async def fetch_repo_data(self, owner, repo_name):
+        variables = {"owner": owner, "name": repo_name, "since": snapshot_since_date()}
+        data, errors = await self.run_graphql_query_partial(REPO_SNAPSHOT_QUERY, variables)
+        if any(e.get("type") != "NOT_FOUND" for e in errors):
+            raise aiohttp.ClientError(f"GraphQL errors: {errors}")
+        repo = data.get("repository")
+        if not repo:
+            print(f"Repository {owner}/{repo_name} not found in GraphQL response.", flush=True)
+            return None
+        scored_repo = parse_repo_snapshot(owner, repo_name, repo)
+        # Same REST fallback as repo_fetcher.fill_pushed_at_from_rest
+        if not scored_repo["pushedAt"]:
+            rest = await self._get_json(f"/repos/{owner}/{repo_name}")
+            scored_repo["pushedAt"] = (rest or {}).get("pushed_at") or ""
+        return scored_repo
+
+    async def fetch_code_snippets(self, owner, repo_name, max_files=3, max_lines=50):
+        files = await self._get_json(f"/repos/{owner}/{repo_name}/contents")
+        if not files:
+            return []
+
+        async def fetch_one(file_info):
+            try:
+                content_data = await self._get_json(file_info["url"])
+                return build_snippet(file_info, content_data, max_lines) if content_data else None
+            except Exception as e:
+                print(f"Error processing file {file_info.get('name')}: {e}", flush=True)
+                return None
+
+        results = await asyncio.gather(*(fetch_one(f) for f in select_snippet_files(files, max_files)))
+        return [snippet for snippet in results if snippet]
+
+    async def fetch_user_profiles(self, logins):
+        now = time.time()
+        profiles, missing = cached_user_profiles(logins, now)
+        if missing:
+            variables = {f"l{i}": login for i, login in enumerate(missing)}
+            data, errors = await self.run_graphql_query_partial(user_profile_query(len(missing)), variables)
+            profiles.update(remember_user_profiles(missing, data, errors, now))
+        return profiles
+
+    async def fetch_contributors_with_locations(self, owner, repo, top_n=10):
+        """Contributor count from the Link header of a per_page=1 listing, profiles in one GraphQL query."""
+        url = f"/repos/{owner}/{repo}/contributors"
+        status, headers, body = await self._get(url, params={"per_page": 1})
+        if status >= 400:
+            raise aiohttp.ClientError(f"GET {url} failed: {status} - {body[:200]!r}")
+        total_contributors = (
+            count_from_links(links_from_header(headers.get("Link")), lambda: json.loads(body)) if status == 200 else 0
+        )
+
+        top_contributors = []
+        if total_contributors:
+            top_contributors = ((await self._get_json(url, params={"per_page": top_n})) or [])[:top_n]
+
+        logins = [c.get("login") for c in top_contributors if c.get("login")]
+        profiles = await self.fetch_user_profiles(logins) if logins else {}
+        return {
+            "total_contributors": total_contributors,
+            "top_contributors": contributor_details(top_contributors, profiles),
+        }
+
+    async def fetch_readme(self, owner, repo_name, max_chars=10000, keywords=None):
+        data = await self._get_json(f"/repos/{owner}/{repo_name}/readme")
+        if not data:
+            return None
+        return readme_snippet(data, max_chars=max_chars, keywords=keywords)
+
+    async def fetch_pull_requests(self, owner, repo, state="all", per_page=100, max_items=100):
+        return await self._paginate(f"/repos/{owner}/{repo}/pulls", {"state": state}, per_page, max_items)
+
+    async def fetch_pr_reviews(self, owner, repo, pr_number, per_page=100, max_items=100):
+        return await self._paginate(f"/repos/{owner}/{repo}/pulls/{pr_number}/reviews", {}, per_page, max_items)
+
+    async def fetch_issues(self, owner, repo, state="all", per_page=100, max_items=100):
+        return await self._paginate(f"/repos/{owner}/{repo}/issues", {"state": state}, per_page, max_items)
+
+    async def fetch_issue_comments(self, owner, repo, issue_number, per_page=100, max_items=100):
+        total_pages = (max_items + per_page - 1) // per_page
+        url = f"/repos/{owner}/{repo}/issues/{issue_number}/comments"
+        pages = await asyncio.gather(
+            *(self._get_json(url, params={"per_page": per_page, "page": page}) for page in range(1, total_pages + 1))
+        )
+        comments = [comment for page in pages if page for comment in page]
+        return comments[:max_items]
@@ -0,0 +1,47 @@
+import os
+
+# ---------- GitHub transport ----------
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+# Sized for the thread pools that share it (search fan-out, issue comment fan-out, batch scoring).
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "32"))
+GITHUB_CONNECT_TIMEOUT = float(os.getenv("GITHUB_CONNECT_TIMEOUT", "5"))
+GITHUB_READ_TIMEOUT = float(os.getenv("GITHUB_READ_TIMEOUT", "30"))
+
+# ---------- Conditional-request cache ----------
+# Stores ETag/Last-Modified plus body per GET so repeats revalidate with a (free) 304.
+GITHUB_HTTP_CACHE_ENABLED = os.getenv("GITHUB_HTTP_CACHE_ENABLED", "1") == "1"
+GITHUB_HTTP_CACHE_PATH = os.getenv(
+    "GITHUB_HTTP_CACHE_PATH", os.path.join(os.path.dirname(__file__), "github_http_cache.db")
+)
+GITHUB_HTTP_CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_HTTP_CACHE_MAX_ENTRIES", "200000"))
+
+# ---------- Rate limiting ----------
+# Comma-separated pool of tokens to spread load across; falls back to GITHUB_TOKEN.
+GITHUB_TOKENS = [t.strip() for t in os.getenv("GITHUB_TOKENS", os.getenv("GITHUB_TOKEN", "")).split(",") if t.strip()]
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "5"))
+# Secondary limits come without a reset time; GitHub asks clients to wait at least a minute.
+GITHUB_SECONDARY_BACKOFF_SECONDS = float(os.getenv("GITHUB_SECONDARY_BACKOFF_SECONDS", "60"))
+GITHUB_MAX_BACKOFF_SECONDS = float(os.getenv("GITHUB_MAX_BACKOFF_SECONDS", "900"))
+# Minimum spacing between calls per token, per resource (search allows 30 requests/minute).
+GITHUB_MIN_INTERVAL_SECONDS = {
+    "core": float(os.getenv("GITHUB_CORE_MIN_INTERVAL", "0")),
+    "search": float(os.getenv("GITHUB_SEARCH_MIN_INTERVAL", "2.0")),
+    "graphql": float(os.getenv("GITHUB_GRAPHQL_MIN_INTERVAL", "0")),
+}
+# Once less than this fraction of a budget is left, spread the rest evenly until reset.
+GITHUB_PACE_BELOW_FRACTION = float(os.getenv("GITHUB_PACE_BELOW_FRACTION", "0.1"))
+
+# ---------- Async client ----------
+GITHUB_ASYNC_MAX_CONNECTIONS = int(os.getenv("GITHUB_ASYNC_MAX_CONNECTIONS", "200"))
+GITHUB_ASYNC_MAX_PER_HOST = int(os.getenv("GITHUB_ASYNC_MAX_PER_HOST", "50"))
+
+# ---------- GraphQL batching ----------
+GRAPHQL_SNAPSHOT_BATCH_SIZE = int(os.getenv("GRAPHQL_SNAPSHOT_BATCH_SIZE", "25"))
+# GitHub rejects queries that could return more than 500,000 nodes.
+GRAPHQL_MAX_NODES_PER_QUERY = int(os.getenv("GRAPHQL_MAX_NODES_PER_QUERY", "500000"))
+
+# ---------- Contributor profiles ----------
+# The same people contribute to many repos, so their profiles are cached across repos.
+USER_PROFILE_TTL_SECONDS = float(os.getenv("USER_PROFILE_TTL_HOURS", "168")) * 3600
+USER_PROFILE_CACHE_SIZE = int(os.getenv("USER_PROFILE_CACHE_SIZE", "20000"))
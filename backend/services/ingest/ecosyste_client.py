@@ -1,15 +1,12 @@
-import os
-from google import genai
 import re
-from services.scoring.database import get_cached_score, save_score
+from services.scoring.database import get_cached_score, update_score
+from services.scoring import config
+from services.scoring.llm_gateway import generate_text
+from services.scoring.prompt_builder import PromptBuilder
 
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY environment variable is not set")
-
-
-client = genai.Client(api_key=GEMINI_API_KEY)
+# Bump when the prompt or the parsing of its reply changes, so cached replies are not reused.
+CODE_QUALITY_PROMPT_VERSION = "code-quality-1"
 
 
 def parse_score_from_text(text):
@@ -22,26 +19,33 @@ def parse_score_from_text(text):
     return None
 
 
-def get_aggregated_code_quality_score(snippets, owner=None, repo_name=None):
+def build_code_quality_prompt(header, snippets, budget=None):
+    """Header plus each snippet as its own section, sharing the token budget; unused budget carries over."""
+    remaining = budget or config.CODE_QUALITY_PROMPT_TOKENS
+    builder = PromptBuilder(header + "\n")
+    for i, s in enumerate(snippets):
+        remaining -= builder.add_section(f"// File: {s['file_path']}", s["content"], remaining // (len(snippets) - i))
+    return builder.build()
+
+
+def get_aggregated_code_quality_score(snippets, owner=None, repo_name=None, repo_key=None, default=0):
     """
     Calculates aggregated code quality score using Gemini AI on code snippets.
     If owner and repo_name provided, caches results by repo key.
+    Tokens sent are recorded under repo_key (default "owner/repo_name").
+    Returns `default` (not cached) when Gemini fails or its reply has no score, so callers
+    with a better fallback can pass default=None and tell failures apart from a real 0.
     """
     if owner and repo_name:
         cached = get_cached_score(owner, repo_name)
         if cached and "code_quality_score" in cached:
             print(f"Using cached code quality score for {owner}/{repo_name}: {cached['code_quality_score']}")
             return cached["code_quality_score"]
-    else:
-        cached = {}
 
     if not snippets:
         print("No code snippets provided, returning 0 score")
         return 0
 
-    combined_content = "\n\n".join([f"// File: {s['file_path']}\n{s['content']}" for s in snippets])
-    print(f"Combined content length for code quality scoring: {len(combined_content)} characters")
-
     standard_prompt = (
         "You are a software quality expert. Assess the overall code quality "
         "based on the following combined code snippets from the main files of a repository. "
@@ -49,24 +53,22 @@ def get_aggregated_code_quality_score(snippets, owner=None, repo_name=None):
         "Provide a normalized score from 0 (poor) to 10 (excellent). Reply with only the numeric score."
     )
 
-    input_text = f"{standard_prompt}\n\n{combined_content}"
+    input_text = build_code_quality_prompt(standard_prompt, snippets)
+    print(f"Code quality prompt length: {len(input_text)} characters")
+    repo_key = repo_key or (f"{owner}/{repo_name}" if owner and repo_name else None)
 
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=input_text
-        )
+        score = generate_text(input_text, CODE_QUALITY_PROMPT_VERSION, repo=repo_key, parse=parse_score_from_text)
         print("Received response from Gemini model")
     except Exception as e:
         print(f"Error querying Gemini model: {e}")
-        return 0
+        return default
 
-    score = parse_score_from_text(response.text)
-    score = score if score is not None else 0
+    if score is None:
+        return default
 
     if owner and repo_name:
-        cached["code_quality_score"] = score
-        save_score(owner, repo_name, cached)
+        update_score(owner, repo_name, {"code_quality_score": score})
         print(f"Saved code quality score for {owner}/{repo_name}: {score}")
 
     return score
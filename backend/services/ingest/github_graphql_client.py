@@ -1,24 +1,24 @@
-import os
 import requests
+from services.ingest.github_session import GITHUB_GRAPHQL_URL, github_post
 
-GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN") or "ghp_xxx_replace_me"
 
-headers = {
-    "Authorization": f"Bearer {GITHUB_TOKEN}",
-    "Accept": "application/json",
-    "User-Agent": "oss-discoverability-ingest"
-}
-
-def run_graphql_query(query: str, variables: dict):
-    response = requests.post(
+def run_graphql_query_partial(query: str, variables: dict):
+    """
+    Like run_graphql_query, but returns (data, errors) instead of raising on GraphQL errors,
+    so aliased multi-repo queries can keep the parts that resolved.
+    """
+    response = github_post(
         GITHUB_GRAPHQL_URL,
         json={"query": query, "variables": variables},
-        headers=headers,
-        timeout=30
+        headers={"Accept": "application/json"},
     )
     response.raise_for_status()
     data = response.json()
-    if "errors" in data:
-        raise requests.exceptions.HTTPError(f"GraphQL errors: {data['errors']}")
-    return data["data"]
+    return data.get("data") or {}, data.get("errors") or []
+
+
+def run_graphql_query(query: str, variables: dict):
+    data, errors = run_graphql_query_partial(query, variables)
+    if errors:
+        raise requests.exceptions.HTTPError(f"GraphQL errors: {errors}")
+    return data
@@ -0,0 +1,141 @@
+from threading import Lock
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from services.ingest import config
+from services.ingest.http_cache import ConditionalCache
+from services.ingest.rate_limiter import RateLimitScheduler, resource_for_url
+
+GITHUB_API_URL = config.GITHUB_API_URL
+GITHUB_GRAPHQL_URL = config.GITHUB_GRAPHQL_URL
+
+DEFAULT_TIMEOUT = (config.GITHUB_CONNECT_TIMEOUT, config.GITHUB_READ_TIMEOUT)
+
+_session = None
+_session_lock = Lock()
+_http_cache = None
+_scheduler = RateLimitScheduler(
+    config.GITHUB_TOKENS,
+    min_intervals=config.GITHUB_MIN_INTERVAL_SECONDS,
+    pace_below_fraction=config.GITHUB_PACE_BELOW_FRACTION,
+)
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config.GITHUB_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept": "application/vnd.github+json",
+        "User-Agent": "oss-discoverability-ingest",
+    })
+    return session
+
+
+def get_session():
+    """Process-wide keep-alive session shared by every GitHub call."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_http_cache():
+    global _http_cache
+    if _http_cache is None and config.GITHUB_HTTP_CACHE_ENABLED:
+        with _session_lock:
+            if _http_cache is None:
+                _http_cache = ConditionalCache(config.GITHUB_HTTP_CACHE_PATH, config.GITHUB_HTTP_CACHE_MAX_ENTRIES)
+    return _http_cache
+
+
+def http_cache_stats():
+    cache = get_http_cache()
+    return cache.stats() if cache else {}
+
+
+def get_scheduler():
+    return _scheduler
+
+
+def rate_limit_status():
+    return _scheduler.status()
+
+
+def count_from_link_header(response):
+    """
+    Total item count of a per_page=1 listing: the page number of its rel="last" link,
+    or the length of the body when everything fits on one page.
+    """
+    return count_from_links(response.links, response.json)
+
+
+def links_from_header(value):
+    """Parse a Link header into {rel: link}, the shape of requests' Response.links."""
+    return {link.get("rel") or link.get("url"): link for link in requests.utils.parse_header_links(value or "")}
+
+
+def count_from_links(links, load_items):
+    last_url = links.get("last", {}).get("url")
+    if last_url:
+        page = parse_qs(urlparse(last_url).query).get("page", ["0"])[0]
+        return int(page)
+    return len(load_items() or [])
+
+
+def _url(path_or_url):
+    if path_or_url.startswith("http://") or path_or_url.startswith("https://"):
+        return path_or_url
+    return f"{GITHUB_API_URL}/{path_or_url.lstrip('/')}"
+
+
+def github_get(path_or_url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, use_cache=True):
+    """
+    GET a GitHub REST resource; accepts a path relative to the API root or a full URL.
+    Repeat requests are revalidated against the conditional-request cache, so an
+    unchanged resource costs a 304 instead of a full, rate-limited download.
+    """
+    url = _url(path_or_url)
+    cache = get_http_cache() if use_cache else None
+    if cache is None:
+        return _send("GET", url, params=params, headers=headers, timeout=timeout)
+
+    key = cache.make_key(url, params, (headers or {}).get("Accept"))
+    entry = cache.lookup(key)
+    request_headers = dict(headers or {})
+    if entry:
+        request_headers.update(cache.validators(entry))
+
+    response = _send("GET", url, params=params, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and entry:
+        return cache.replay(key, entry, response)
+    cache.record_miss()
+    cache.store(key, response)
+    return response
+
+
+def github_post(path_or_url, json=None, headers=None, timeout=DEFAULT_TIMEOUT):
+    return _send("POST", _url(path_or_url), json=json, headers=headers, timeout=timeout)
+
+
+def _send(method, url, headers=None, **kwargs):
+    """Send one request through the rate-limit scheduler, retrying after 403/429 back-offs."""
+    resource = resource_for_url(url)
+    attempt = 0
+    while True:
+        token = _scheduler.acquire(resource)
+        request_headers = dict(headers or {})
+        if token:
+            request_headers["Authorization"] = f"Bearer {token}"
+        response = get_session().request(method, url, headers=request_headers, **kwargs)
+        _scheduler.record(token, resource, response.headers)
+        limited = _scheduler.is_rate_limited(response.status_code, response.headers, response.text)
+        if not limited or attempt >= config.GITHUB_MAX_RETRIES:
+            return response
+        _scheduler.back_off(token, resource, response.status_code, response.headers, attempt)
+        attempt += 1
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import sqlite3
+import time
+from threading import Lock, local
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Revalidation responses refresh these; everything else comes from the stored response.
+_FRESH_HEADER_PREFIXES = ("x-ratelimit-", "date", "retry-after")
+_PRUNE_EVERY_WRITES = 500
+
+
+class ConditionalCache:
+    """
+    On-disk store of GitHub REST responses keyed by URL, params and Accept header.
+    Holds the validators (ETag / Last-Modified) needed to revalidate with a conditional
+    request; GitHub answers unchanged resources with 304, which is not billed to the rate limit.
+    """
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = local()
+        self._stats_lock = Lock()
+        self._writes = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stored = 0
+        self.bytes_saved = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " url TEXT NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(url, params=None, accept=None):
+        raw = json.dumps([url, sorted((params or {}).items()), accept or ""], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        row = self._connect().execute(
+            "SELECT etag, last_modified, headers, body, url FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, headers, body, url = row
+        return {"etag": etag, "last_modified": last_modified, "headers": json.loads(headers), "body": body, "url": url}
+
+    def validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response):
+        self.store_raw(key, response.status_code, response.headers, response.content, response.url)
+
+    def store_raw(self, key, status, headers, body, url):
+        """store() for clients that do not use requests (e.g. the asyncio client)."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if status != 200 or not (etag or last_modified):
+            return
+        self._connect().execute(
+            "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, url, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, etag, last_modified, json.dumps(dict(headers)), body, url, time.time()),
+        )
+        with self._stats_lock:
+            self.stored += 1
+            self._writes += 1
+            prune = self._writes % _PRUNE_EVERY_WRITES == 0
+        if prune:
+            self._prune()
+
+    def _prune(self):
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def replay(self, key, entry, not_modified):
+        """Build a 200 response from a stored entry after the server answered 304."""
+        headers = self.revalidate(key, entry, not_modified.headers)
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response._content = entry["body"]
+        response.headers = headers
+        response.url = entry["url"]
+        response.encoding = requests.utils.get_encoding_from_headers(headers)
+        response.request = not_modified.request
+        response.from_cache = True
+        return response
+
+    def revalidate(self, key, entry, fresh_headers):
+        """Mark a stored entry as confirmed by a 304; returns its headers with the 304's rate-limit headers."""
+        self._connect().execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        headers = CaseInsensitiveDict(entry["headers"])
+        for name, value in fresh_headers.items():
+            if name.lower().startswith(_FRESH_HEADER_PREFIXES):
+                headers[name] = value
+        with self._stats_lock:
+            self.revalidated += 1
+            self.bytes_saved += len(entry["body"])
+        return headers
+
+    def record_miss(self):
+        with self._stats_lock:
+            self.misses += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                "revalidated_304": self.revalidated,
+                "misses": self.misses,
+                "stored": self.stored,
+                "bytes_saved": self.bytes_saved,
+            }
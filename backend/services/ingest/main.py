@@ -1,10 +1,9 @@
 from typing import Dict, Any
 from services.scoring.database import get_cached_score, save_score
-from services.ingest.repo_fetcher import fetch_repo_data, fetch_code_snippets
-from services.ingest.ecosyste_client import get_aggregated_code_quality_score
-from services.scoring.maintenance import calculate_category_1_score
-from services.scoring.community import calculate_category_3_score
-from services.scoring.documentation import get_documentation_score
+from services.scoring.freshness import schedule_refresh, component_inputs
+from services.scoring.summary import summarize_scores
+from services.scoring.singleflight import scoring_flight, flight_key
+from services.scoring.pipeline import RepoNotFoundError, run_repo_scoring
 
 
 def process_repo(owner: str, repo_name: str) -> Dict[str, Any]:
@@ -14,67 +13,37 @@ def process_repo(owner: str, repo_name: str) -> Dict[str, Any]:
     cached = get_cached_score(owner, repo_name)
     if cached:
         print(f"  Cache hit for {owner}/{repo_name}. Returning cached scores.")
+        schedule_refresh(owner, repo_name, cached)
         return cached
 
-    # Cache miss - full fetch and scoring
-    repo_data = fetch_repo_data(owner, repo_name)
-    if not repo_data:
+    # Cache miss - full fetch and scoring, shared with any concurrent caller for the same repo
+    return scoring_flight.do(flight_key(owner, repo_name, "process"), _process_repo_uncached, owner, repo_name)
+
+
+def _process_repo_uncached(owner: str, repo_name: str) -> Dict[str, Any]:
+    ctx, scores, errors = run_repo_scoring(owner, repo_name)
+    if isinstance(errors.get("snapshot"), RepoNotFoundError):
         raise ValueError(f"Repository {owner}/{repo_name} not found or inaccessible.")
+    for stage in ("snapshot", "maintenance_score"):
+        if stage in errors:
+            raise RuntimeError(f"Scoring {owner}/{repo_name} failed at {stage}: {errors[stage]}")
+    repo_data = ctx.snapshot
 
     print(f"  Fetched repo data: keys = {list(repo_data.keys())}")
 
-    snippets = fetch_code_snippets(owner, repo_name)
+    snippets = ctx.snippets or []
     print(f"  Fetched {len(snippets)} code snippets")
 
-    try:
-        maintenance_score = calculate_category_1_score(repo_data)
-    except Exception as e:
-        maintenance_score = 0
-        print(f"Error calculating maintenance score: {e}")
-
-    try:
-        code_quality_score = get_aggregated_code_quality_score(snippets)
-    except Exception as e:
-        code_quality_score = 0
-        print(f"Error calculating code quality score: {e}")
-
-    try:
-        community_score = calculate_category_3_score(owner, repo_name)
-    except Exception as e:
-        community_score = 0
-        print(f"Error calculating community score: {e}")
+    maintenance_score = scores["maintenance_score"]
+    code_quality_score = scores["code_quality_score"]
+    community_score = scores["community_engagement_score"]
+    documentation_score = scores["documentation_score"]
 
-    try:
-        documentation_score = get_documentation_score(owner, repo_name)
-    except Exception as e:
-        documentation_score = 0
-        print(f"Error calculating documentation score: {e}")
-
-    combined_score = round(
-        0.4 * maintenance_score +
-        0.25 * code_quality_score +
-        0.25 * community_score +
-        0.10 * documentation_score,
-        2
+    combined_score, highlights, special_mentions = summarize_scores(
+        maintenance_score, code_quality_score, community_score, documentation_score
     )
     print(f"  Combined score: {combined_score}")
 
-    highlights = []
-    special_mentions = []
-    threshold_high = 8.0
-    threshold_low = 5.0
-    scores_dict = {
-        "Maintenance": maintenance_score,
-        "Code Quality": code_quality_score,
-        "Community": community_score,
-        "Documentation": documentation_score,
-    }
-    for cat, score in scores_dict.items():
-        if score >= threshold_high:
-            highlights.append(cat)
-        elif score < threshold_low:
-            special_mentions.append(f"Weak in {cat}")
-
     result = {
         "owner": owner,
         "repo": repo_name,
@@ -86,8 +55,15 @@ def process_repo(owner: str, repo_name: str) -> Dict[str, Any]:
         "top_highlights": highlights,
         "special_mentions": special_mentions,
         "num_snippets": len(snippets),
+        "component_inputs": component_inputs(repo_data, [c for c in scores if c not in errors]),
     }
 
+    if errors:
+        # Failed components scored 0 above; report them and cache nothing so the next run retries
+        result["failed_components"] = sorted(errors)
+        print(f"  Not caching {owner}/{repo_name}: {sorted(errors)} failed")
+        return result
+
     save_score(owner, repo_name, result)
     print(f"  Saved scores for {owner}/{repo_name} in cache.")
     return result
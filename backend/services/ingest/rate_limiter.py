@@ -0,0 +1,145 @@
+import random
+import time
+from threading import Lock
+
+from services.ingest import config
+
+RESOURCES = ("core", "search", "graphql")
+
+
+def resource_for_url(url):
+    if url.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if "/search/" in url:
+        return "search"
+    return "core"
+
+
+class _Budget:
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.next_slot = 0.0
+
+
+class RateLimitScheduler:
+    """
+    Central pacing for GitHub traffic.
+    Tracks the REST (core), search and GraphQL budgets of every token separately from the
+    X-RateLimit-* headers, hands each request the token with the most budget left, spaces
+    calls out when a budget runs low, and parks a token until its reset / Retry-After
+    time when GitHub answers 403 or 429.
+    """
+
+    def __init__(self, tokens, min_intervals=None, pace_below_fraction=0.1):
+        self.tokens = list(tokens) or [None]
+        self.min_intervals = min_intervals or {}
+        self.pace_below_fraction = pace_below_fraction
+        self._budgets = {(t, r): _Budget() for t in self.tokens for r in RESOURCES}
+        self._blocked_until = {t: 0.0 for t in self.tokens}
+        self._lock = Lock()
+
+    def _available_at(self, token, resource, now):
+        budget = self._budgets[(token, resource)]
+        available = self._blocked_until[token]
+        if budget.remaining is not None and budget.remaining <= 0 and budget.reset_at > now:
+            available = max(available, budget.reset_at)
+        return max(available, budget.next_slot)
+
+    def _interval(self, budget, resource, now):
+        interval = self.min_intervals.get(resource, 0)
+        if (
+            budget.limit and budget.remaining is not None
+            and budget.remaining < budget.limit * self.pace_below_fraction
+            and budget.reset_at > now
+        ):
+            interval = max(interval, (budget.reset_at - now) / max(budget.remaining, 1))
+        return interval
+
+    def acquire(self, resource):
+        """Reserve a slot for one request and return the token to send it with (None if unauthenticated)."""
+        token, wait = self.reserve(resource)
+        if wait > 0:
+            if wait >= 1:
+                print(f"[rate-limit] waiting {wait:.1f}s for {resource} budget", flush=True)
+            time.sleep(wait)
+        return token
+
+    def reserve(self, resource):
+        """Non-blocking half of acquire: returns (token, seconds to wait before sending)."""
+        with self._lock:
+            now = time.time()
+            token = min(
+                self.tokens,
+                key=lambda t: (
+                    self._available_at(t, resource, now),
+                    -(self._budgets[(t, resource)].remaining or 0),
+                ),
+            )
+            budget = self._budgets[(token, resource)]
+            start = max(now, self._available_at(token, resource, now))
+            budget.next_slot = start + self._interval(budget, resource, start)
+            if budget.remaining is not None:
+                budget.remaining -= 1
+        return token, start - now
+
+    def record(self, token, resource, headers):
+        """Update a token's budget from the rate-limit headers of a response."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", resource)
+        if resource not in RESOURCES:
+            resource = "search" if "search" in resource else "core"
+        with self._lock:
+            budget = self._budgets[(token, resource)]
+            try:
+                budget.remaining = int(remaining)
+                budget.limit = int(headers.get("X-RateLimit-Limit", budget.limit or 0)) or budget.limit
+                budget.reset_at = float(headers.get("X-RateLimit-Reset", budget.reset_at))
+            except ValueError:
+                pass
+
+    @staticmethod
+    def is_rate_limited(status, headers, body_text=""):
+        if status == 429:
+            return True
+        if status != 403:
+            return False
+        if headers.get("Retry-After") or headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return "rate limit" in (body_text or "").lower()
+
+    def back_off(self, token, resource, status, headers, attempt):
+        """Park a token after a 403/429 for exactly as long as GitHub asks (or exponentially for secondary limits)."""
+        now = time.time()
+        retry_after = headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            until = now + int(retry_after)
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            until = float(headers.get("X-RateLimit-Reset", now + config.GITHUB_SECONDARY_BACKOFF_SECONDS))
+        else:
+            delay = config.GITHUB_SECONDARY_BACKOFF_SECONDS * (2 ** attempt)
+            until = now + min(delay, config.GITHUB_MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+        until = min(until, now + config.GITHUB_MAX_BACKOFF_SECONDS)
+        with self._lock:
+            self._blocked_until[token] = max(self._blocked_until[token], until)
+        print(
+            f"[rate-limit] {resource} limited (HTTP {status}); "
+            f"token #{self.tokens.index(token)} parked for {until - now:.0f}s",
+            flush=True,
+        )
+
+    def status(self):
+        with self._lock:
+            return [
+                {
+                    "token": index,
+                    "resource": resource,
+                    "remaining": self._budgets[(token, resource)].remaining,
+                    "reset_at": self._budgets[(token, resource)].reset_at,
+                }
+                for index, token in enumerate(self.tokens)
+                for resource in RESOURCES
+            ]
@@ -0,0 +1,109 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from services.ingest.repo_fetcher import (
+    fetch_repo_data,
+    fetch_code_snippets,
+    fetch_contributors_with_locations,
+    fetch_readme,
+    fetch_pr_review_summaries,
+    fetch_issue_response_summaries,
+)
+
+
+@dataclass
+class RepoContext:
+    """
+    Everything fetched about one repo during a scoring request.
+    Fields already known (e.g. from a search result or a batched snapshot) are filled in up
+    front; the get_* accessors fetch anything missing on first use and remember it, so each
+    field is fetched at most once per repo per request, even when stages run concurrently.
+    """
+
+    owner: str
+    name: str
+    stars: Optional[int] = None
+    open_issues: Optional[int] = None
+    pushed_at: Optional[str] = None
+    topics: Optional[List[str]] = None
+    good_first_issues_count: Optional[int] = None
+    snapshot: Optional[Dict[str, Any]] = None
+    contributors: Optional[Dict[str, Any]] = None
+    pr_summaries: Optional[List[Dict[str, Any]]] = None
+    issue_summaries: Optional[List[Dict[str, Any]]] = None
+    snippets: Optional[List[Dict[str, Any]]] = None
+    readme: Optional[str] = None
+    _fetched: set = field(default_factory=set, repr=False, compare=False)
+    _locks: Dict[str, Lock] = field(default_factory=dict, repr=False, compare=False)
+    _locks_guard: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    @classmethod
+    def from_search_item(cls, item):
+        """Build a context from a search_repos result (REST or GraphQL shape)."""
+        return cls(
+            owner=item["owner"] if isinstance(item["owner"], str) else item["owner"]["login"],
+            name=item["name"],
+            stars=item.get("stars", item.get("stargazers_count")),
+            open_issues=item.get("issues", item.get("open_issues_count")),
+            pushed_at=item.get("last_push") or item.get("pushed_at"),
+            topics=item.get("topics"),
+            good_first_issues_count=item.get("good_first_issues_count"),
+        )
+
+    @property
+    def full_name(self):
+        return f"{self.owner}/{self.name}"
+
+    def _load(self, attr, fetch):
+        if getattr(self, attr) is not None or attr in self._fetched:
+            return getattr(self, attr)
+        with self._locks_guard:
+            lock = self._locks.setdefault(attr, Lock())
+        with lock:
+            if getattr(self, attr) is None and attr not in self._fetched:
+                setattr(self, attr, fetch())
+                self._fetched.add(attr)
+        return getattr(self, attr)
+
+    def set_snapshot(self, snapshot):
+        self.snapshot = snapshot
+        if snapshot:
+            self.pushed_at = snapshot.get("pushedAt") or self.pushed_at
+            self.stars = snapshot.get("stars", self.stars)
+            self.open_issues = snapshot.get("openIssueCount", self.open_issues)
+            self.topics = snapshot.get("topics") or self.topics
+
+    def get_snapshot(self):
+        if self.snapshot is None and "snapshot" not in self._fetched:
+            self._load("snapshot", lambda: fetch_repo_data(self.owner, self.name))
+            self.set_snapshot(self.snapshot)
+        return self.snapshot
+
+    def maintenance_inputs(self):
+        """Snapshot fields calculate_category_1_score reads, with the search pushed_at as fallback."""
+        snapshot = self.get_snapshot() or {}
+        return {
+            "pushedAt": snapshot.get("pushedAt") or self.pushed_at or "",
+            "commitCountLast90Days": snapshot.get("commitCountLast90Days") or 0,
+            "totalCommitCount": snapshot.get("totalCommitCount") or 0,
+            "pullRequests": snapshot.get("pullRequests", {}),
+            "issues": snapshot.get("issues", {}),
+            "ciPresent": snapshot.get("ciPresent", True),
+            "testCoveragePercent": snapshot.get("testCoveragePercent", 80),
+        }
+
+    def get_contributors(self):
+        return self._load("contributors", lambda: fetch_contributors_with_locations(self.owner, self.name))
+
+    def get_pr_summaries(self):
+        return self._load("pr_summaries", lambda: fetch_pr_review_summaries(self.owner, self.name))
+
+    def get_issue_summaries(self):
+        return self._load("issue_summaries", lambda: fetch_issue_response_summaries(self.owner, self.name))
+
+    def get_snippets(self):
+        return self._load("snippets", lambda: fetch_code_snippets(self.owner, self.name))
+
+    def get_readme(self):
+        return self._load("readme", lambda: fetch_readme(self.owner, self.name))
@@ -1,90 +1,210 @@
-import os
 import requests
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import base64
 import re
-from services.ingest.github_graphql_client import run_graphql_query
+import time
+from services.ingest.github_graphql_client import run_graphql_query, run_graphql_query_partial
+from services.ingest import config
+from services.ingest.github_session import GITHUB_API_URL, github_get, count_from_link_header
+from services.lru_cache import LRUCache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-if not GITHUB_TOKEN:
-    raise RuntimeError("GITHUB_TOKEN environment variable is not set")
+if not config.GITHUB_TOKENS:
+    raise RuntimeError("GITHUB_TOKEN (or GITHUB_TOKENS) environment variable is not set")
 
-HEADERS = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
+SNAPSHOT_TOPICS_LIMIT = 20
 
-GITHUB_API_URL = "https://api.github.com"
-
-REPO_SNAPSHOT_QUERY = """
-query RepoSnapshot($owner: String!, $name: String!, $since: GitTimestamp!) {
-  repository(owner: $owner, name: $name) {
+REPO_SNAPSHOT_FIELDS = """
+fragment RepoSnapshotFields on Repository {
+  name
+  owner { login }
+  pushedAt
+  stargazerCount
+  issues { totalCount }
+  openIssues: issues(states: OPEN) { totalCount }
+  pullRequests { totalCount }
+  repositoryTopics(first: %d) {
+    nodes { topic { name } }
+  }
+  defaultBranchRef {
     name
-    owner { login }
-    pushedAt
-    defaultBranchRef {
-      name
-      target {
-        ... on Commit {
-          totalCommits: history {
-            totalCount
-          }
-          recentCommits: history(since: $since) {
-            totalCount
-          }
+    target {
+      ... on Commit {
+        totalCommits: history {
+          totalCount
+        }
+        recentCommits: history(since: $since) {
+          totalCount
+        }
+        tree {
+          entries { name type oid }
         }
       }
     }
   }
 }
-"""
+""" % SNAPSHOT_TOPICS_LIMIT
 
-def fetch_repo_data(owner, repo_name):
-    from datetime import timezone, datetime, timedelta
-    import requests
+REPO_SNAPSHOT_QUERY = """
+query RepoSnapshot($owner: String!, $name: String!, $since: GitTimestamp!) {
+  repository(owner: $owner, name: $name) {
+    ...RepoSnapshotFields
+  }
+}
+""" + REPO_SNAPSHOT_FIELDS
 
-    since_date = (datetime.now(timezone.utc) - timedelta(days=90)).isoformat().replace("+00:00", "Z")
-    variables = {"owner": owner, "name": repo_name, "since": since_date}
-    data = run_graphql_query(REPO_SNAPSHOT_QUERY, variables)
-    repo = data.get("repository", None)
-    if not repo:
-        print(f"Repository {owner}/{repo_name} not found in GraphQL response.", flush=True)
-        return None
+SNIPPET_EXTENSIONS = (".py", ".js", ".java", ".kt", ".cpp", ".c", ".ts", ".go", ".rb")
+
+
+def select_snippet_files(entries, max_files=3):
+    """Root-level source files fetch_code_snippets samples, in listing order (REST or GraphQL tree entries)."""
+    return [
+        e for e in entries
+        if e.get("type") in ("file", "blob") and e.get("name", "").endswith(SNIPPET_EXTENSIONS)
+    ][:max_files]
+
+
+def find_readme_entry(entries):
+    for e in entries:
+        if e.get("type") in ("file", "blob") and e.get("name", "").lower().startswith("readme"):
+            return e
+    return None
+
+def snapshot_since_date(days=90):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat().replace("+00:00", "Z")
 
-    pushed_at = repo.get("pushedAt")
 
+def parse_repo_snapshot(owner, repo_name, repo):
+    """Flatten a RepoSnapshot `repository` node into the dict the scorers consume."""
     dbr = repo.get("defaultBranchRef") or {}
     tgt = dbr.get("target") or {}
 
     total_commit_count = tgt.get("totalCommits", {}).get("totalCount", 0)
     commit_count_last_90_days = tgt.get("recentCommits", {}).get("totalCount", 0)
 
-    # Fallback to REST if pushedAt missing
-    if not pushed_at:
-        try:
-            rest = requests.get(f"{GITHUB_API_URL}/repos/{owner}/{repo_name}", headers=HEADERS, timeout=15)
-            if rest.ok:
-                pushed_at = rest.json().get("pushed_at") or ""
-                print(f"[REST fallback] pushed_at for {owner}/{repo_name}: {pushed_at}", flush=True)
-            else:
-                print(f"[REST fallback] Failed for {owner}/{repo_name} with status {rest.status_code}", flush=True)
-        except Exception as e:
-            print(f"[REST fallback] Error fetching pushed_at for {owner}/{repo_name}: {e}", flush=True)
+    # Content fingerprints used to skip rescoring components whose inputs have not changed
+    root_entries = (tgt.get("tree") or {}).get("entries") or []
+    readme_entry = find_readme_entry(root_entries)
 
-    scored_repo = {
+    return {
         "owner": owner,
         "name": repo_name,
         "full_name": f"{owner}/{repo_name}",
-        "pushedAt": pushed_at,
+        "pushedAt": repo.get("pushedAt"),
         "commitCountLast90Days": commit_count_last_90_days,
         "totalCommitCount": total_commit_count,
+        "issueCount": (repo.get("issues") or {}).get("totalCount", 0),
+        "pullRequestCount": (repo.get("pullRequests") or {}).get("totalCount", 0),
+        "openIssueCount": (repo.get("openIssues") or {}).get("totalCount", 0),
+        "stars": repo.get("stargazerCount", 0),
+        "topics": [n["topic"]["name"] for n in (repo.get("repositoryTopics") or {}).get("nodes") or []],
+        "readmeSha": readme_entry.get("oid") if readme_entry else None,
+        "snippetShas": [e.get("oid") for e in select_snippet_files(root_entries)],
     }
 
 
+def fill_pushed_at_from_rest(snapshot):
+    """GraphQL occasionally omits pushedAt; fill it in from the REST repo endpoint."""
+    if snapshot["pushedAt"]:
+        return
+    owner, repo_name = snapshot["owner"], snapshot["name"]
+    try:
+        rest = github_get(f"/repos/{owner}/{repo_name}")
+        if rest.ok:
+            snapshot["pushedAt"] = rest.json().get("pushed_at") or ""
+            print(f"[REST fallback] pushed_at for {owner}/{repo_name}: {snapshot['pushedAt']}", flush=True)
+        else:
+            print(f"[REST fallback] Failed for {owner}/{repo_name} with status {rest.status_code}", flush=True)
+    except Exception as e:
+        print(f"[REST fallback] Error fetching pushed_at for {owner}/{repo_name}: {e}", flush=True)
+
+
+def fetch_repo_data(owner, repo_name):
+    variables = {"owner": owner, "name": repo_name, "since": snapshot_since_date()}
+    data, errors = run_graphql_query_partial(REPO_SNAPSHOT_QUERY, variables)
+    # None means the repo does not exist (or is not visible); any other error is raised
+    if any(e.get("type") != "NOT_FOUND" for e in errors):
+        raise requests.exceptions.HTTPError(f"GraphQL errors: {errors}")
+    repo = data.get("repository", None)
+    if not repo:
+        print(f"Repository {owner}/{repo_name} not found in GraphQL response.", flush=True)
+        return None
+
+    scored_repo = parse_repo_snapshot(owner, repo_name, repo)
+
+    fill_pushed_at_from_rest(scored_repo)
+
     print(scored_repo, flush=True)
     print("-----", flush=True)
     return scored_repo
 
 
+# Nodes one RepoSnapshotFields selection counts toward GitHub's limit: the repository plus
+# repositoryTopics(first: N); the other connections only select totalCount and add none.
+_SNAPSHOT_NODES_PER_REPO = 1 + SNAPSHOT_TOPICS_LIMIT
+
+
+def _build_batch_snapshot_query(count):
+    var_defs = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    selections = "\n".join(
+        f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{ ...RepoSnapshotFields }}" for i in range(count)
+    )
+    return f"query RepoSnapshotBatch($since: GitTimestamp!, {var_defs}) {{\n{selections}\n}}\n" + REPO_SNAPSHOT_FIELDS
+
+
+def _fetch_snapshot_chunk(chunk, since):
+    variables = {"since": since}
+    for i, (owner, repo_name) in enumerate(chunk):
+        variables[f"o{i}"] = owner
+        variables[f"n{i}"] = repo_name
+
+    try:
+        data, errors = run_graphql_query_partial(_build_batch_snapshot_query(len(chunk)), variables)
+        # Errors without a path reject the whole query (node/cost limits, timeouts)
+        query_failed = any(not e.get("path") for e in errors)
+    except Exception as e:
+        data, errors, query_failed = {}, [{"message": str(e)}], True
+
+    if query_failed:
+        if len(chunk) > 1:
+            mid = len(chunk) // 2
+            print(f"Batched snapshot of {len(chunk)} repos failed, splitting: {errors[0].get('message')}", flush=True)
+            return {**_fetch_snapshot_chunk(chunk[:mid], since), **_fetch_snapshot_chunk(chunk[mid:], since)}
+        owner, repo_name = chunk[0]
+        print(f"Snapshot failed for {owner}/{repo_name}: {errors[0].get('message')}", flush=True)
+        return {f"{owner}/{repo_name}": None}
+
+    alias_errors = {e["path"][0]: e.get("message") for e in errors}
+    results = {}
+    for i, (owner, repo_name) in enumerate(chunk):
+        repo = data.get(f"r{i}")
+        if repo:
+            snapshot = parse_repo_snapshot(owner, repo_name, repo)
+            fill_pushed_at_from_rest(snapshot)
+            results[f"{owner}/{repo_name}"] = snapshot
+        else:
+            print(f"Snapshot failed for {owner}/{repo_name}: {alias_errors.get(f'r{i}', 'not found')}", flush=True)
+            results[f"{owner}/{repo_name}"] = None
+    return results
+
+
+def fetch_repo_data_batch(repos, batch_size=None):
+    """
+    Snapshot many repositories with aliased GraphQL queries instead of one round trip each.
+    repos is a list of (owner, repo_name); returns {"owner/repo": snapshot or None}, where None
+    marks a repo that could not be fetched. Chunks are sized to stay under GitHub's node limit
+    and are split in half automatically if GitHub still rejects them.
+    """
+    batch_size = batch_size or config.GRAPHQL_SNAPSHOT_BATCH_SIZE
+    batch_size = max(1, min(batch_size, config.GRAPHQL_MAX_NODES_PER_QUERY // _SNAPSHOT_NODES_PER_REPO))
+    since = snapshot_since_date()
+
+    results = {}
+    for start in range(0, len(repos), batch_size):
+        results.update(_fetch_snapshot_chunk(list(repos[start:start + batch_size]), since))
+    print(f"Fetched {sum(1 for v in results.values() if v)}/{len(repos)} repo snapshots in batches of {batch_size}", flush=True)
+    return results
 
 
 def extract_comments_and_code(lines):
@@ -109,13 +229,27 @@ def extract_comments_and_code(lines):
     snippet_text = "\n".join(comments) + "\n\n" + "\n".join(code_lines[:20])
     return snippet_text.strip()
 
+def build_snippet(file_info, content_data, max_lines=50):
+    """
+    "content" is the comment-first, truncated excerpt sent to the LLM; "source" keeps the
+    whole decoded file for static analysis, which needs code that still parses.
+    """
+    encoded_content = content_data.get("content", "")
+    decoded_content = base64.b64decode(encoded_content).decode("utf-8", errors="ignore")
+    lines = decoded_content.splitlines()[:max_lines]
+    return {
+        "file_path": file_info.get("path"),
+        "sha": file_info.get("sha"),
+        "content": extract_comments_and_code(lines),
+        "source": decoded_content,
+    }
+
+
 def fetch_code_snippets(owner, repo_name, max_files=3, max_lines=50):
-    valid_extensions = (".py", ".js", ".java", ".kt", ".cpp", ".c", ".ts", ".go", ".rb")
-    headers = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
-    url = f"https://api.github.com/repos/{owner}/{repo_name}/contents"
+    url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/contents"
     snippets = []
 
-    response = requests.get(url, headers=headers)
+    response = github_get(url)
     if response.status_code != 200:
         print(f"Failed to fetch root contents: {response.text}")
         return snippets
@@ -128,21 +262,14 @@ def fetch_code_snippets(owner, repo_name, max_files=3, max_lines=50):
         if file_info.get("type") != "file":
             continue
         filename = file_info.get("name", "")
-        if not filename.endswith(valid_extensions):
+        if not filename.endswith(SNIPPET_EXTENSIONS):
             continue
 
         try:
-            file_resp = requests.get(file_info["url"], headers=headers)
+            file_resp = github_get(file_info["url"])
             if file_resp.status_code != 200:
                 continue
-            content_data = file_resp.json()
-            encoded_content = content_data.get("content", "")
-            decoded_content = base64.b64decode(encoded_content).decode("utf-8", errors="ignore")
-
-            lines = decoded_content.splitlines()[:max_lines]
-            snippet_content = extract_comments_and_code(lines)
-
-            snippets.append({"file_path": file_info.get("path"), "content": snippet_content})
+            snippets.append(build_snippet(file_info, file_resp.json(), max_lines))
             count += 1
 
         except Exception as e:
@@ -150,47 +277,98 @@ def fetch_code_snippets(owner, repo_name, max_files=3, max_lines=50):
             continue
 
     print(f"Collected {len(snippets)} main file snippets for analysis")
-    print(snippets)
     return snippets
 
-def fetch_contributors_with_locations(owner, repo, top_n=10):
+def user_profile_query(count):
+    var_defs = ", ".join(f"$l{i}: String!" for i in range(count))
+    selections = "\n".join(f"  u{i}: user(login: $l{i}) {{ location createdAt }}" for i in range(count))
+    return f"query UserProfiles({var_defs}) {{\n{selections}\n}}"
+
+
+_profile_cache = LRUCache(config.USER_PROFILE_CACHE_SIZE)
+
+
+def cached_user_profiles(logins, now):
+    """Split logins into (profiles still cached, logins that need a lookup)."""
+    profiles = {}
+    missing = []
+    for login in logins:
+        cached = _profile_cache.get(login)
+        if cached and cached[0] > now:
+            profiles[login] = cached[1]
+        else:
+            missing.append(login)
+    return profiles, missing
+
+
+def remember_user_profiles(missing, data, errors, now):
+    """Profiles from a user_profile_query reply for `missing`; resolved ones are cached."""
+    if errors:
+        print(f"User profile lookup errors: {[e.get('message') for e in errors]}", flush=True)
+    profiles = {}
+    for i, login in enumerate(missing):
+        user = data.get(f"u{i}") or {}
+        profile = {"location": user.get("location"), "created_at": user.get("createdAt")}
+        profiles[login] = profile
+        if data.get(f"u{i}") is not None:
+            _profile_cache.put(login, (now + config.USER_PROFILE_TTL_SECONDS, profile))
+    return profiles
+
+
+def fetch_user_profiles(logins):
     """
-    Fetch total contributor count and detailed info for top N contributors.
+    Location and account creation time for several users in one aliased GraphQL query.
+    Profiles are cached across repos for USER_PROFILE_TTL_HOURS. Logins GraphQL cannot
+    resolve (bots, deleted accounts) come back with empty fields.
     """
-    contributors_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/contributors?per_page=100"
-    all_contributors = []
-    page = 1
+    now = time.time()
+    profiles, missing = cached_user_profiles(logins, now)
+    if missing:
+        variables = {f"l{i}": login for i, login in enumerate(missing)}
+        data, errors = run_graphql_query_partial(user_profile_query(len(missing)), variables)
+        profiles.update(remember_user_profiles(missing, data, errors, now))
+    return profiles
 
-    # Paginate to get all contributors
-    while True:
-        resp = requests.get(f"{contributors_url}&page={page}", headers=HEADERS)
-        resp.raise_for_status()
-        batch = resp.json()
-        if not batch:
-            break
-        all_contributors.extend(batch)
-        page += 1
-
-    total_contributors = len(all_contributors)
-    top_contributors = all_contributors[:top_n]
 
+def contributor_details(top_contributors, profiles):
+    """Entries of fetch_contributors_with_locations' top_contributors list."""
     detailed_contributors = []
     for contributor in top_contributors:
         username = contributor.get("login")
-        user_url = f"{GITHUB_API_URL}/users/{username}"
-        user_resp = requests.get(user_url, headers=HEADERS)
-        user_resp.raise_for_status()
-        user_data = user_resp.json()
+        profile = profiles.get(username, {})
         detailed_contributors.append({
             "login": username,
             "contributions": contributor.get("contributions"),
-            "location": user_data.get("location"),
-            "created_at": user_data.get("created_at")
+            "location": profile.get("location"),
+            "created_at": profile.get("created_at")
         })
+    return detailed_contributors
+
+
+def fetch_contributors_with_locations(owner, repo, top_n=10):
+    """
+    Fetch total contributor count and detailed info for top N contributors.
+    The count comes from the pagination Link header of a per_page=1 request, and
+    the top contributors' profiles from one batched GraphQL query.
+    """
+    contributors_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/contributors"
+
+    count_resp = github_get(contributors_url, params={"per_page": 1})
+    count_resp.raise_for_status()
+    total_contributors = count_from_link_header(count_resp) if count_resp.status_code == 200 else 0
+
+    top_contributors = []
+    if total_contributors:
+        top_resp = github_get(contributors_url, params={"per_page": top_n})
+        top_resp.raise_for_status()
+        top_contributors = (top_resp.json() or [])[:top_n]
+
+    logins = [c.get("login") for c in top_contributors if c.get("login")]
+    profiles = fetch_user_profiles(logins) if logins else {}
 
     return {
         "total_contributors": total_contributors,
-        "top_contributors": detailed_contributors
+        "top_contributors": contributor_details(top_contributors, profiles)
     }
 
 
@@ -207,11 +385,15 @@ def fetch_readme(owner, repo_name, max_chars=10000, keywords=None):
     :return: filtered README snippet string
     """
     url = f"{GITHUB_API_URL}/repos/{owner}/{repo_name}/readme"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(url)
     if response.status_code != 200:
         print(f"Failed to fetch README: {response.text}")
         return None
-    data = response.json()
+    return readme_snippet(response.json(), max_chars=max_chars, keywords=keywords)
+
+
+def readme_snippet(data, max_chars=10000, keywords=None):
+    """Decode a /readme API payload and apply fetch_readme's keyword filter and length limit."""
     content = data.get("content", "")
     encoding = data.get("encoding", "base64")
     if encoding == "base64":
@@ -262,7 +444,7 @@ def fetch_pull_requests(owner, repo, state="all", per_page=100, max_items=100):
     while len(prs) < max_items:
         url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/pulls"
         params = {"state": state, "per_page": min(per_page, max_items - len(prs)), "page": page}
-        resp = requests.get(url, headers=HEADERS, params=params)
+        resp = github_get(url, params=params)
         if resp.status_code != 200:
             print(f"Failed to fetch pull requests: {resp.status_code}, {resp.text}")
             break
@@ -282,7 +464,7 @@ def fetch_pr_reviews(owner, repo, pr_number, per_page=100, max_items=100):
     while len(reviews) < max_items:
         url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
         params = {"per_page": min(per_page, max_items - len(reviews)), "page": page}
-        resp = requests.get(url, headers=HEADERS, params=params)
+        resp = github_get(url, params=params)
         if resp.status_code != 200:
             print(f"Failed to fetch PR reviews: {resp.status_code}, {resp.text}")
             break
@@ -297,13 +479,110 @@ def fetch_pr_reviews(owner, repo, pr_number, per_page=100, max_items=100):
     return reviews[:max_items]
 
 
+PR_REVIEW_SUMMARY_QUERY = """
+query PullRequestReviewSummaries($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        createdAt
+        reviews(first: 1) {
+          totalCount
+          nodes { submittedAt }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def fetch_pr_review_summaries(owner, repo, max_items=100):
+    """
+    Newest PRs (same order as fetch_pull_requests) with their review count and first review time,
+    100 PRs per GraphQL call instead of one /reviews call per PR.
+    review_count is capped at 100 to match what fetch_pr_reviews would have returned.
+    """
+    summaries = []
+    after = None
+    while len(summaries) < max_items:
+        variables = {"owner": owner, "name": repo, "first": min(100, max_items - len(summaries)), "after": after}
+        data = run_graphql_query(PR_REVIEW_SUMMARY_QUERY, variables)
+        connection = ((data.get("repository") or {}).get("pullRequests")) or {}
+        for pr in connection.get("nodes") or []:
+            reviews = pr.get("reviews") or {}
+            first_review = (reviews.get("nodes") or [{}])[0]
+            summaries.append({
+                "number": pr.get("number"),
+                "created_at": pr.get("createdAt"),
+                "review_count": min(reviews.get("totalCount", 0), 100),
+                "first_review_at": first_review.get("submittedAt"),
+            })
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+
+    return summaries[:max_items]
+
+
+ISSUE_RESPONSE_SUMMARY_QUERY = """
+query IssueResponseSummaries($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        createdAt
+        comments(first: 1) {
+          totalCount
+          nodes { createdAt }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def fetch_issue_response_summaries(owner, repo, max_items=100):
+    """
+    Newest issues (pull requests excluded) with their comment count and first comment time,
+    100 issues per GraphQL call instead of one /comments call per issue.
+    comment_count is capped at 100 to match what fetch_issue_comments would have returned.
+    """
+    summaries = []
+    after = None
+    while len(summaries) < max_items:
+        variables = {"owner": owner, "name": repo, "first": min(100, max_items - len(summaries)), "after": after}
+        data = run_graphql_query(ISSUE_RESPONSE_SUMMARY_QUERY, variables)
+        connection = ((data.get("repository") or {}).get("issues")) or {}
+        for issue in connection.get("nodes") or []:
+            comments = issue.get("comments") or {}
+            first_comment = (comments.get("nodes") or [{}])[0]
+            summaries.append({
+                "number": issue.get("number"),
+                "created_at": issue.get("createdAt"),
+                "comment_count": min(comments.get("totalCount", 0), 100),
+                "first_comment_at": first_comment.get("createdAt"),
+            })
+        page_info = connection.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+
+    print(f"Fetched {len(summaries)} issue summaries for {owner}/{repo}", flush=True)
+    return summaries[:max_items]
+
+
 def fetch_issues(owner, repo, state="all", per_page=100, max_items=100):
     issues = []
     page = 1
     while len(issues) < max_items:
         url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues"
         params = {"state": state, "per_page": min(per_page, max_items - len(issues)), "page": page}
-        resp = requests.get(url, headers=HEADERS, params=params)
+        resp = github_get(url, params=params)
         if resp.status_code != 200:
             print(f"Failed to fetch issues: {resp.status_code} - {resp.text}")
             break
@@ -327,7 +606,7 @@ def fetch_issue_comments(owner, repo, issue_number, per_page=100, max_items=100)
     def fetch_page(page):
         url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues/{issue_number}/comments"
         params = {"per_page": per_page, "page": page}
-        resp = requests.get(url, headers=HEADERS, params=params)
+        resp = github_get(url, params=params)
         if resp.status_code == 200:
             return resp.json()
         else:
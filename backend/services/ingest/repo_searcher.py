@@ -1,12 +1,30 @@
-import os
-import requests
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-HEADERS = {"Authorization": f"Bearer {GITHUB_TOKEN}"} if GITHUB_TOKEN else {}
+from services.ingest.github_session import GITHUB_API_URL, github_get, count_from_link_header
+from services.ingest.github_graphql_client import run_graphql_query
+
+SEARCH_REPOS_QUERY = """
+query SearchRepos($q: String!, $first: Int!, $after: String) {
+  search(query: $q, type: REPOSITORY, first: $first, after: $after) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Repository {
+        nameWithOwner
+        name
+        owner { login }
+        stargazerCount
+        pushedAt
+        openIssues: issues(states: OPEN) { totalCount }
+        goodFirstIssues: issues(labels: ["good first issue"], states: OPEN) { totalCount }
+        repositoryTopics(first: 20) {
+          nodes { topic { name } }
+        }
+      }
+    }
+  }
+}
+"""
 
 # ---------- Query Builder ----------
 def build_github_search_query(
@@ -42,18 +60,15 @@ def build_github_search_query(
 def fetch_good_first_issues_count(owner: str, repo: str) -> int:
     url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues"
     params = {"state": "open", "labels": "good first issue", "per_page": 1}
-    response = requests.get(url, headers=HEADERS, params=params, timeout=10)
+    response = github_get(url, params=params)
     if response.status_code != 200:
         return 0
-    issues = response.json()
-    return len(issues)
+    return count_from_link_header(response)
 
 
 def fetch_repo_topics(owner: str, repo: str) -> List[str]:
     url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/topics"
-    headers = dict(HEADERS)
-    headers["Accept"] = "application/vnd.github.mercy-preview+json"
-    response = requests.get(url, headers=headers, timeout=10)
+    response = github_get(url, headers={"Accept": "application/vnd.github.mercy-preview+json"})
     if response.status_code != 200:
         return []
     return response.json().get("names", [])
@@ -112,27 +127,55 @@ def _fetch_and_process_page(
                         break
     return new_repos
 
-def search_repos(
-    keywords: Optional[str] = None,
-    language: Optional[str] = None,
-    min_good_first_issues: int = 0,
-    max_good_first_issues: int = 1000,
-    topics: Optional[List[str]] = None,
-    recent_commit_days: int = 180,
-    max_repos: int = 200,
-) -> List[Dict]:
+def _repo_from_search_node(node):
+    return {
+        "full_name": node["nameWithOwner"],
+        "owner": node["owner"]["login"],
+        "name": node["name"],
+        "stars": node.get("stargazerCount", 0),
+        "issues": (node.get("openIssues") or {}).get("totalCount", 0),
+        "last_push": node.get("pushedAt"),
+        "topics": [n["topic"]["name"] for n in (node.get("repositoryTopics") or {}).get("nodes") or []],
+        "good_first_issues_count": (node.get("goodFirstIssues") or {}).get("totalCount", 0),
+    }
+
+
+def _search_repos_graphql(query, min_good_first_issues, max_good_first_issues, max_repos, per_page=100):
+    """
+    GraphQL search that returns topics and the open good-first-issue count inline,
+    so the good-first-issue filter needs no per-repo round trips.
+    """
     repos = []
     seen = set()
-    per_page = 100
-    query = build_github_search_query(
-        keywords, language, topics, min_good_first_issues, max_good_first_issues, recent_commit_days
-    )
+    after = None
+    while len(repos) < max_repos:
+        variables = {"q": f"{query} sort:stars-desc", "first": per_page, "after": after}
+        data = run_graphql_query(SEARCH_REPOS_QUERY, variables)
+        search = data.get("search") or {}
+        for node in search.get("nodes") or []:
+            if not node or node.get("nameWithOwner") in seen:
+                continue
+            repo = _repo_from_search_node(node)
+            seen.add(repo["full_name"])
+            if min_good_first_issues <= repo["good_first_issues_count"] <= max_good_first_issues:
+                repos.append(repo)
+                if len(repos) >= max_repos:
+                    break
+        page_info = search.get("pageInfo") or {}
+        if not page_info.get("hasNextPage"):
+            break
+        after = page_info.get("endCursor")
+    return repos
 
+
+def _search_repos_rest(query, min_good_first_issues, max_good_first_issues, max_repos, per_page=100):
+    repos = []
+    seen = set()
     page = 1
     while len(repos) < max_repos:
         url = f"{GITHUB_API_URL}/search/repositories"
         params = {"q": query, "sort": "stars", "order": "desc", "per_page": per_page, "page": page}
-        response = requests.get(url, headers=HEADERS, params=params, timeout=20)
+        response = github_get(url, params=params)
         if response.status_code != 200:
             print(f"GitHub API error {response.status_code}: {response.text}")
             break
@@ -150,3 +193,23 @@ def search_repos(
         page += 1
 
     return repos
+
+
+def search_repos(
+    keywords: Optional[str] = None,
+    language: Optional[str] = None,
+    min_good_first_issues: int = 0,
+    max_good_first_issues: int = 1000,
+    topics: Optional[List[str]] = None,
+    recent_commit_days: int = 180,
+    max_repos: int = 200,
+) -> List[Dict]:
+    query = build_github_search_query(
+        keywords, language, topics, min_good_first_issues, max_good_first_issues, recent_commit_days
+    )
+
+    try:
+        return _search_repos_graphql(query, min_good_first_issues, max_good_first_issues, max_repos)
+    except Exception as e:
+        print(f"GraphQL search failed, falling back to REST search: {e}")
+        return _search_repos_rest(query, min_good_first_issues, max_good_first_issues, max_repos)
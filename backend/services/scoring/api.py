@@ -1,17 +1,21 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import threading
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-from services.scoring.database import get_cached_score, save_score
-from services.ingest.repo_fetcher import (
-    fetch_repo_data,
-    fetch_code_snippets,
-)
-from services.ingest.ecosyste_client import get_aggregated_code_quality_score
-from services.scoring.maintenance import calculate_category_1_score
-from services.scoring.community import calculate_category_3_score
-from services.scoring.documentation import get_documentation_score
+from services.scoring import config
+from services.scoring.database import get_cached_score, save_score, cache_stats
 from services.scoring.enhanced_scoring import batch_score_repositories
+from services.scoring.freshness import schedule_refresh, component_inputs
+from services.scoring.summary import summarize_scores
+from services.scoring.singleflight import scoring_flight, flight_key
+from services.scoring.pipeline import RepoNotFoundError, run_repo_scoring
+from services.scoring.jobs import submit_job, get_job_store
+from services.scoring.llm_cache import llm_cache_stats
+from services.scoring.llm_usage import get_usage_ledger
 from services.ingest.repo_searcher import search_repos
 
 
@@ -37,51 +41,44 @@ def score_repo(req: RepoRequest):
     cached = get_cached_score(req.owner, req.repo_name)
     if cached:
         print(f"Cache hit for {req.owner}/{req.repo_name}, returning cached data.", flush=True)
+        schedule_refresh(req.owner, req.repo_name, cached)
         return cached
 
-    # Perform full scoring if cache miss
-    repo_data = fetch_repo_data(req.owner, req.repo_name)
-    if not repo_data:
+    # Concurrent misses for the same repo wait on one shared scoring run
+    return scoring_flight.do(
+        flight_key(req.owner, req.repo_name, "score"), _score_repo_uncached, req
+    )
+
+
+def _score_repo_uncached(req: RepoRequest):
+    ctx, scores, errors = run_repo_scoring(req.owner, req.repo_name)
+    if isinstance(errors.get("snapshot"), RepoNotFoundError):
         print(f"Repository {req.owner}/{req.repo_name} not found or access denied", flush=True)
         raise HTTPException(status_code=404, detail="Repository not found or access denied")
+    # Without a snapshot or maintenance score there is nothing worth returning
+    for stage in ("snapshot", "maintenance_score"):
+        if stage in errors:
+            raise HTTPException(status_code=502, detail=f"Error scoring repository ({stage}): {errors[stage]}")
+    repo_data = ctx.snapshot
     print(f"Fetched repo data keys: {list(repo_data.keys())}", flush=True)
 
-    snippets = fetch_code_snippets(req.owner, req.repo_name)
+    snippets = ctx.snippets or []
     print(f"Fetched {len(snippets)} snippets", flush=True)
 
-    maintenance_score = calculate_category_1_score(repo_data)
-    code_quality_score = get_aggregated_code_quality_score(snippets)
-    community_score = calculate_category_3_score(req.owner, req.repo_name)
-    documentation_score = get_documentation_score(req.owner, req.repo_name)
-
-    combined_score = round(
-        0.4 * maintenance_score +
-        0.25 * code_quality_score +
-        0.25 * community_score +
-        0.10 * documentation_score,
-        2
+    maintenance_score = scores["maintenance_score"]
+    code_quality_score = scores["code_quality_score"]
+    community_score = scores["community_engagement_score"]
+    documentation_score = scores["documentation_score"]
+
+    combined_score, highlights, special_mentions = summarize_scores(
+        maintenance_score, code_quality_score, community_score, documentation_score
     )
     print(f"Computed combined score: {combined_score}", flush=True)
 
-    highlights = []
-    special_mentions = []
-    threshold_high = 8.0
-    threshold_low = 5.0
-    scores_dict = {
-        "Maintenance": maintenance_score,
-        "Code Quality": code_quality_score,
-        "Community": community_score,
-        "Documentation": documentation_score,
-    }
-    for cat, score in scores_dict.items():
-        if score >= threshold_high:
-            highlights.append(cat)
-        elif score < threshold_low:
-            special_mentions.append(f"Weak in {cat}")
-
     result = {
         "repo": f"{req.owner}/{req.repo_name}",
         "score_category_1": maintenance_score,
+        "maintenance_score": maintenance_score,
         "code_quality_score": code_quality_score,
         "community_engagement_score": community_score,
         "documentation_score": documentation_score,
@@ -89,13 +86,40 @@ def score_repo(req: RepoRequest):
         "top_highlights": highlights,
         "special_mentions": special_mentions,
         "num_snippets": len(snippets),
+        "component_inputs": component_inputs(repo_data, [c for c in scores if c not in errors]),
     }
 
+    if errors:
+        # Failed components scored 0 above; report them and cache nothing so the next request retries
+        result["failed_components"] = sorted(errors)
+        print(f"Not caching {req.owner}/{req.repo_name}: {sorted(errors)} failed", flush=True)
+        return result
+
     save_score(req.owner, req.repo_name, result)
     print(f"Saved scored data for {req.owner}/{req.repo_name} in cache", flush=True)
     return result
 
 
+@app.get("/cache/stats")
+def get_cache_stats():
+    return cache_stats()
+
+
+@app.get("/cache/llm_stats")
+def get_llm_cache_stats():
+    return llm_cache_stats()
+
+
+@app.get("/llm_usage")
+def get_llm_usage():
+    return get_usage_ledger().totals()
+
+
+@app.get("/llm_usage/{owner}/{repo_name}")
+def get_repo_llm_usage(owner: str, repo_name: str):
+    return get_usage_ledger().for_repo(f"{owner}/{repo_name}")
+
+
 class FilterCriteria(BaseModel):
     keywords: Optional[str] = None
     language: Optional[str] = None
@@ -105,24 +129,33 @@ class FilterCriteria(BaseModel):
     recent_commit_days: Optional[int] = 90
 
 
-@app.post("/search_and_score")
-def search_and_score(filters: FilterCriteria):
-    print("Received /search_and_score request with filters:", filters.dict(), flush=True)
+def _run_search(filters: FilterCriteria):
+    return search_repos(
+        keywords=filters.keywords,
+        language=filters.language,
+        min_good_first_issues=filters.min_good_first_issues or 0,
+        max_good_first_issues=filters.max_good_first_issues or 1000,
+        topics=filters.topics or [],
+        recent_commit_days=filters.recent_commit_days or 90,
+        max_repos=150,
+    )
+
+
+def _search_for(filters: FilterCriteria):
     try:
-        repos = search_repos(
-            keywords=filters.keywords,
-            language=filters.language,
-            min_good_first_issues=filters.min_good_first_issues or 0,
-            max_good_first_issues=filters.max_good_first_issues or 1000,
-            topics=filters.topics or [],
-            recent_commit_days=filters.recent_commit_days or 90,
-            max_repos=150,
-        )
+        repos = _run_search(filters)
         print(f"Found {len(repos)} repos matching filters", flush=True)
+        return repos
     except Exception as e:
         print("Search repos error:", e, flush=True)
         raise HTTPException(status_code=500, detail=f"Error searching repositories: {e}")
 
+
+@app.post("/search_and_score")
+def search_and_score(filters: FilterCriteria):
+    print("Received /search_and_score request with filters:", filters.dict(), flush=True)
+    repos = _search_for(filters)
+
     if not repos:
         print("No repos found matching search criteria", flush=True)
         return []
@@ -135,3 +168,93 @@ def search_and_score(filters: FilterCriteria):
         raise HTTPException(status_code=500, detail=f"Error scoring repositories: {e}")
 
     return scored_repos
+
+
+@app.post("/search_and_score/stream")
+def search_and_score_stream(filters: FilterCriteria, request: Request):
+    """
+    Same search and scoring as /search_and_score, streamed as NDJSON. Each line is
+    {"event": ..., "data": ...}: a "repo" event per repo once maintenance and community are
+    scored (or "failed" if it could not be fetched), a "patch" event per top-tier repo when
+    documentation and code quality arrive, then one "ranking" event with the final sorted
+    list (or an "error" event). Scoring stops once the client disconnects.
+    """
+    print("Received /search_and_score/stream request with filters:", filters.dict(), flush=True)
+    repos = _search_for(filters)
+    cancelled = threading.Event()
+
+    async def stream():
+        if not repos:
+            yield json.dumps({"event": "ranking", "data": []}) + "\n"
+            return
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def put(item):
+            if cancelled.is_set():
+                return
+            try:
+                loop.call_soon_threadsafe(events.put_nowait, item)
+            except RuntimeError:
+                # The event loop already closed behind a disconnected client
+                cancelled.set()
+
+        def run():
+            try:
+                batch_score_repositories(repos, on_event=lambda event, data: put((event, data)), cancelled=cancelled)
+            except Exception as e:
+                print("Batch scoring error:", e, flush=True)
+                put(("error", {"detail": f"Error scoring repositories: {e}"}))
+            put(None)
+
+        threading.Thread(target=run, daemon=True).start()
+        try:
+            while True:
+                # Wake up regularly so a client that left is noticed even while no event arrives
+                try:
+                    item = await asyncio.wait_for(events.get(), config.STREAM_DISCONNECT_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        print("Stream client disconnected; cancelling batch scoring", flush=True)
+                        return
+                    continue
+                if item is None:
+                    return
+                event, data = item
+                yield json.dumps({"event": event, "data": data}) + "\n"
+        finally:
+            # Also runs when Starlette cancels the stream on disconnect
+            cancelled.set()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=202)
+def create_scoring_job(filters: FilterCriteria):
+    """Start a /search_and_score run in the background; poll /jobs/{job_id} for progress."""
+    print("Received /jobs request with filters:", filters.dict(), flush=True)
+    job_id = submit_job(filters.dict(), lambda: _run_search(filters))
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+def get_scoring_job(job_id: str):
+    job = get_job_store().get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@app.get("/jobs/{job_id}/results")
+def get_scoring_job_results(job_id: str):
+    """Final ranked results once the job is done, otherwise the repos scored so far."""
+    store = get_job_store()
+    job = store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "final": job["status"] == "done",
+        "results": store.results(job_id),
+    }
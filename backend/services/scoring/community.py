@@ -1,20 +1,12 @@
-import requests
 from datetime import datetime
-import os
 from dateutil import parser
 from services.scoring.database import get_cached_score, save_score
 from services.ingest.repo_fetcher import (
-    fetch_pull_requests,
-    fetch_pr_reviews,
-    fetch_issues,
-    fetch_issue_comments,
+    fetch_pr_review_summaries,
+    fetch_issue_response_summaries,
     fetch_contributors_with_locations
 )
 
-GITHUB_API_URL = "https://api.github.com"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-HEADERS = {"Authorization": f"Bearer {GITHUB_TOKEN}"}
-
 
 def parse_country_from_location(location_str):
     if not location_str:
@@ -68,8 +60,9 @@ def calculate_contributor_diversity_score_from_list(contributor_data):
     return round(score * 10, 2)
 
 
-def calculate_pr_review_quality(owner, repo):
-    prs = fetch_pull_requests(owner, repo)
+def calculate_pr_review_quality(owner, repo, prs=None):
+    if prs is None:
+        prs = fetch_pr_review_summaries(owner, repo)
     if not prs:
         print(f"No PRs found for {owner}/{repo}")
         return 0
@@ -79,23 +72,16 @@ def calculate_pr_review_quality(owner, repo):
     reviewed_pr_count = 0
 
     for pr in prs:
-        pr_number = pr["number"]
-        pr_created = parser.parse(pr["created_at"])
-
-        reviews = fetch_pr_reviews(owner, repo, pr_number)
-        if not reviews:
+        if not pr["review_count"]:
             continue
 
         reviewed_pr_count += 1
-        total_review_comments += len(reviews)
+        total_review_comments += pr["review_count"]
 
-        first_review_time = min(
-            parser.parse(review["submitted_at"])
-            for review in reviews
-            if review.get("submitted_at")
-        )
-        latency_seconds = (first_review_time - pr_created).total_seconds()
-        total_review_latencies.append(latency_seconds)
+        if pr["first_review_at"]:
+            first_review_time = parser.parse(pr["first_review_at"])
+            latency_seconds = (first_review_time - parser.parse(pr["created_at"])).total_seconds()
+            total_review_latencies.append(latency_seconds)
 
     if reviewed_pr_count == 0:
         print(f"No reviewed PRs found for {owner}/{repo}")
@@ -112,8 +98,9 @@ def calculate_pr_review_quality(owner, repo):
     return round(final_score, 2)
 
 
-def calculate_issue_responsiveness(owner, repo):
-    issues = fetch_issues(owner, repo)
+def calculate_issue_responsiveness(owner, repo, issues=None):
+    if issues is None:
+        issues = fetch_issue_response_summaries(owner, repo)
     if not issues:
         print(f"No issues found for {owner}/{repo}")
         return 0
@@ -122,22 +109,16 @@ def calculate_issue_responsiveness(owner, repo):
     comments_counts = []
 
     for issue in issues:
-        if "pull_request" in issue:
+        if not issue["comment_count"]:
             continue
 
-        issue_number = issue["number"]
-        issue_created = parser.parse(issue["created_at"])
-
-        comments = fetch_issue_comments(owner, repo, issue_number)
-        if not comments:
-            continue
+        if issue["first_comment_at"]:
+            first_comment_time = parser.parse(issue["first_comment_at"])
+            response_time = (first_comment_time - parser.parse(issue["created_at"])).total_seconds()
+            if response_time >= 0:
+                response_times.append(response_time)
 
-        first_comment_time = min(parser.parse(c["created_at"]) for c in comments if c.get("created_at"))
-        response_time = (first_comment_time - issue_created).total_seconds()
-        if response_time >= 0:
-            response_times.append(response_time)
-
-        comments_counts.append(len(comments))
+        comments_counts.append(issue["comment_count"])
 
     if not response_times or not comments_counts:
         print(f"No comments or response times found for {owner}/{repo}")
@@ -161,7 +142,16 @@ def calculate_issue_responsiveness(owner, repo):
     return round(final_score, 2)
 
 
-def calculate_category_3_score(owner, repo, contributors=None):
+def calculate_category_3_score(owner, repo, contributors=None, context=None):
+    """
+    Community score from contributors, PR review quality and issue responsiveness.
+    With a RepoContext, inputs already fetched in this request are reused instead of re-fetched.
+    """
+    pr_summaries = issue_summaries = None
+    if context is not None:
+        contributors = contributors if contributors is not None else context.get_contributors()
+        pr_summaries = context.get_pr_summaries()
+        issue_summaries = context.get_issue_summaries()
     if contributors is None:
         contributors = fetch_contributors_with_locations(owner, repo)
 
@@ -176,8 +166,8 @@ def calculate_category_3_score(owner, repo, contributors=None):
         print(f"No top contributors found for {owner}/{repo}")
 
     contributor_score = calculate_contributor_diversity_score_from_list(contributors)
-    pr_score = calculate_pr_review_quality(owner, repo)
-    issue_score = calculate_issue_responsiveness(owner, repo)
+    pr_score = calculate_pr_review_quality(owner, repo, pr_summaries)
+    issue_score = calculate_issue_responsiveness(owner, repo, issue_summaries)
 
     score = 0.8 * contributor_score + 0.1 * pr_score + 0.1 * issue_score
     print(f"Community score for {owner}/{repo}: {score}")
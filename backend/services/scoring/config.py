@@ -0,0 +1,83 @@
+import os
+
+_SCORING_DIR = os.path.dirname(__file__)
+
+# ---------- Score store ----------
+# "sqlite" (default) or "json" for the legacy whole-file cache.
+SCORE_STORE_BACKEND = os.getenv("SCORE_STORE_BACKEND", "sqlite")
+SCORE_DB_PATH = os.getenv("SCORE_DB_PATH", os.path.join(_SCORING_DIR, "score_cache.db"))
+SCORE_JSON_PATH = os.getenv("SCORE_JSON_PATH", os.path.join(_SCORING_DIR, "score_cache.json"))
+SQLITE_BUSY_TIMEOUT_SECONDS = float(os.getenv("SQLITE_BUSY_TIMEOUT_SECONDS", "10"))
+SCORE_HOT_CACHE_SIZE = int(os.getenv("SCORE_HOT_CACHE_SIZE", "2048"))
+
+# ---------- Freshness ----------
+# Each component score is served until its TTL expires, then refreshed in the background.
+COMPONENT_TTL_SECONDS = {
+    "maintenance_score": float(os.getenv("MAINTENANCE_TTL_HOURS", "24")) * 3600,
+    "community_engagement_score": float(os.getenv("COMMUNITY_TTL_HOURS", "72")) * 3600,
+    "documentation_score": float(os.getenv("DOCUMENTATION_TTL_HOURS", "336")) * 3600,
+    "code_quality_score": float(os.getenv("CODE_QUALITY_TTL_HOURS", "336")) * 3600,
+}
+REFRESH_WORKERS = int(os.getenv("REFRESH_WORKERS", "2"))
+
+# ---------- Batch scoring ----------
+# Worker threads per phase: maintenance/community for the top 100, documentation/code quality for the top 15.
+BATCH_BASIC_WORKERS = int(os.getenv("BATCH_BASIC_WORKERS", "16"))
+BATCH_DETAIL_WORKERS = int(os.getenv("BATCH_DETAIL_WORKERS", "5"))
+# Caps on concurrent in-flight work per external service, across both phases.
+BATCH_GITHUB_CONCURRENCY = int(os.getenv("BATCH_GITHUB_CONCURRENCY", "16"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", "4"))
+# Threads for the per-repo stage graph (fetches and scorers that share no inputs run side by side).
+SCORE_STAGE_WORKERS = int(os.getenv("SCORE_STAGE_WORKERS", "8"))
+# How often /search_and_score/stream checks for a gone client while no event is ready.
+STREAM_DISCONNECT_POLL_SECONDS = float(os.getenv("STREAM_DISCONNECT_POLL_SECONDS", "1"))
+
+# ---------- Scoring jobs ----------
+# Jobs live in their own tables; by default in the same SQLite file as the score store.
+SCORE_JOB_DB_PATH = os.getenv("SCORE_JOB_DB_PATH", SCORE_DB_PATH)
+# Search-and-score jobs run one after another on this many threads.
+SCORE_JOB_WORKERS = int(os.getenv("SCORE_JOB_WORKERS", "2"))
+# Each process refreshes its unfinished jobs this often; jobs not refreshed within
+# SCORE_JOB_STALE_SECONDS belong to a dead process and are marked interrupted.
+SCORE_JOB_HEARTBEAT_SECONDS = float(os.getenv("SCORE_JOB_HEARTBEAT_SECONDS", "30"))
+SCORE_JOB_STALE_SECONDS = float(os.getenv("SCORE_JOB_STALE_SECONDS", "180"))
+
+# ---------- Documentation scoring ----------
+# Score all four README criteria in one structured Gemini request; "false" restores one request per criterion.
+DOCUMENTATION_SINGLE_PROMPT = os.getenv("DOCUMENTATION_SINGLE_PROMPT", "true").lower() == "true"
+
+# ---------- LLM response cache ----------
+# Gemini replies keyed by hash(model, prompt template version, prompt), so identical prompts
+# (vendored files, template READMEs, forks) are only ever sent once.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(_SCORING_DIR, "llm_cache.db"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+
+# ---------- Gemini gateway ----------
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+# Requests in flight to Gemini at once, across all scorers and threads.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Retries on 429, 5xx and timeouts, with exponential backoff and full jitter.
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_MAX_BACKOFF_SECONDS = float(os.getenv("LLM_MAX_BACKOFF_SECONDS", "30"))
+
+# ---------- Static code-quality estimate ----------
+# Every batch repo gets a local code-quality estimate; Gemini is asked only for top-tier repos
+# whose estimate is not confident enough, or that rank within the top CODE_QUALITY_LLM_TOP_RANKS.
+STATIC_QUALITY_FULL_CONFIDENCE_LINES = int(os.getenv("STATIC_QUALITY_FULL_CONFIDENCE_LINES", "60"))
+STATIC_QUALITY_MIN_CONFIDENCE = float(os.getenv("STATIC_QUALITY_MIN_CONFIDENCE", "0.6"))
+CODE_QUALITY_LLM_TOP_RANKS = int(os.getenv("CODE_QUALITY_LLM_TOP_RANKS", "5"))
+# Each estimate fetches the root listing plus up to 3 files (~4 REST calls, ~400 for a full
+# batch), so only the first STATIC_QUALITY_MAX_REPOS results get one (0 disables it), and
+# those fetches share their own STATIC_QUALITY_FETCH_CONCURRENCY slots instead of the scorers'.
+STATIC_QUALITY_MAX_REPOS = int(os.getenv("STATIC_QUALITY_MAX_REPOS", "100"))
+STATIC_QUALITY_FETCH_CONCURRENCY = int(os.getenv("STATIC_QUALITY_FETCH_CONCURRENCY", "4"))
+
+# ---------- Prompt budgets ----------
+# Token budgets for prompt sections (estimated at ~4 characters per token).
+CODE_QUALITY_PROMPT_TOKENS = int(os.getenv("CODE_QUALITY_PROMPT_TOKENS", "3000"))
+DOCUMENTATION_SECTION_TOKENS = int(os.getenv("DOCUMENTATION_SECTION_TOKENS", "600"))
+# Per-repo ledger of tokens sent to Gemini; by default next to the response cache.
+LLM_USAGE_DB_PATH = os.getenv("LLM_USAGE_DB_PATH", LLM_CACHE_PATH)
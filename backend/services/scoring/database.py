@@ -1,32 +1,245 @@
+import copy
 import json
 import os
-from threading import Lock
+import sqlite3
+import time
+from threading import Lock, local
 
-DB_FILE = os.path.join(os.path.dirname(__file__), "score_cache.json")
-_lock = Lock()
+from services.lru_cache import LRUCache
+from services.scoring import config
 
-def _read_db():
-    if not os.path.exists(DB_FILE):
-        return {}
-    try:
-        with open(DB_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
 
-def _write_db(data):
-    with open(DB_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+class JsonFileBackend:
+    """
+    Legacy backend: the whole cache lives in a single JSON file.
+    Every lookup re-reads the file, so only use it for small caches or debugging.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _write(self, data):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key):
+        with self._lock:
+            return self._read().get(key)
+
+    def put(self, key, value):
+        with self._lock:
+            data = self._read()
+            data[key] = value
+            self._write(data)
+
+    def update(self, key, fn):
+        with self._lock:
+            data = self._read()
+            merged = fn(dict(data.get(key) or {}))
+            data[key] = merged
+            self._write(data)
+            return merged
+
+
+class SQLiteBackend:
+    """
+    Embedded transactional store keyed by "owner/repo".
+    Runs in WAL mode so readers never block writers, and relies on SQLite's
+    file locking (with a busy timeout) to serialize writers across processes.
+    """
+
+    def __init__(self, path, legacy_json_path=None):
+        self.path = path
+        self._local = local()
+        self._init_schema()
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=config.SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " key TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+
+    def _migrate_json(self, json_path):
+        """One-time import of an existing score_cache.json; existing rows win."""
+        if not os.path.exists(json_path):
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            done = conn.execute("SELECT value FROM meta WHERE name = 'json_migrated'").fetchone()
+            if done:
+                conn.execute("COMMIT")
+                return
+            try:
+                with open(json_path, "r", encoding="utf-8") as f:
+                    legacy = json.load(f)
+            except Exception as e:
+                print(f"Could not read legacy score cache {json_path}: {e}")
+                legacy = {}
+            now = time.time()
+            conn.executemany(
+                "INSERT OR IGNORE INTO scores (key, data, updated_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in legacy.items()],
+            )
+            conn.execute(
+                "INSERT INTO meta (name, value) VALUES ('json_migrated', ?)",
+                (json_path,),
+            )
+            conn.execute("COMMIT")
+            print(f"Migrated {len(legacy)} cached scores from {json_path} into {self.path}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, key):
+        row = self._connect().execute("SELECT data FROM scores WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        self._connect().execute(
+            "INSERT INTO scores (key, data, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            (key, json.dumps(value), time.time()),
+        )
+
+    def update(self, key, fn):
+        """Apply fn to the stored entry (or {}) and write the result inside one write transaction."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM scores WHERE key = ?", (key,)).fetchone()
+            merged = fn(json.loads(row[0]) if row else {})
+            conn.execute(
+                "INSERT INTO scores (key, data, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (key, json.dumps(merged), time.time()),
+            )
+            conn.execute("COMMIT")
+            return merged
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+# Component scores that carry their own timestamp (see services.scoring.freshness).
+COMPONENT_KEYS = (
+    "maintenance_score",
+    "community_engagement_score",
+    "documentation_score",
+    "code_quality_score",
+)
+# Older /score entries stored the maintenance score under this name.
+LEGACY_COMPONENT_ALIASES = {"score_category_1": "maintenance_score"}
+
+_backend = None
+_backend_lock = Lock()
+_hot_cache = LRUCache(config.SCORE_HOT_CACHE_SIZE)
+
+
+def _create_backend():
+    if config.SCORE_STORE_BACKEND == "json":
+        return JsonFileBackend(config.SCORE_JSON_PATH)
+    if config.SCORE_STORE_BACKEND == "sqlite":
+        return SQLiteBackend(config.SCORE_DB_PATH, legacy_json_path=config.SCORE_JSON_PATH)
+    raise ValueError(f"Unknown SCORE_STORE_BACKEND: {config.SCORE_STORE_BACKEND}")
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def set_backend(backend):
+    """Swap the storage backend (e.g. for tests or a shared external store)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+        _hot_cache.clear()
+
+
+def cache_stats():
+    return _hot_cache.stats()
+
 
 def get_cached_score(owner, repo_name):
     key = f"{owner}/{repo_name}"
-    with _lock:
-        data = _read_db()
-        return data.get(key)
+    entry = _hot_cache.get(key)
+    if entry is None:
+        entry = get_backend().get(key)
+        if entry is None:
+            return None
+        _hot_cache.put(key, entry)
+    # Callers mutate the returned dict before saving, so never hand out the cached object.
+    return copy.deepcopy(entry)
+
+
+def stamp_components(entry, components, now=None):
+    """Record that the given component scores in entry were computed at `now`."""
+    now = now if now is not None else time.time()
+    stamps = dict(entry.get("component_updated_at") or {})
+    for component in components:
+        stamps[component] = now
+    entry["component_updated_at"] = stamps
+    return entry
+
 
 def save_score(owner, repo_name, score_data):
     key = f"{owner}/{repo_name}"
-    with _lock:
-        data = _read_db()
-        data[key] = score_data
-        _write_db(data)
+    score_data = dict(score_data)
+    stamped = score_data.get("component_updated_at") or {}
+    stamp_components(score_data, [c for c in COMPONENT_KEYS if c in score_data and c not in stamped])
+    get_backend().put(key, score_data)
+    _hot_cache.put(key, copy.deepcopy(score_data))
+
+
+def modify_score(owner, repo_name, fn):
+    """Atomically apply fn to the cached entry for a repo and return the new entry."""
+    key = f"{owner}/{repo_name}"
+    merged = get_backend().update(key, fn)
+    _hot_cache.put(key, copy.deepcopy(merged))
+    return merged
+
+
+def update_score(owner, repo_name, fields):
+    """Merge fields into the cached entry for a repo and return the merged entry."""
+    def merge(entry):
+        entry.update(fields)
+        return stamp_components(entry, [c for c in COMPONENT_KEYS if c in fields])
+
+    return modify_score(owner, repo_name, merge)
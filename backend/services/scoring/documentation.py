@@ -1,15 +1,27 @@
 import base64
-import os
+import json
 import re
-from google import genai
+from services.scoring import config
 from services.ingest.repo_fetcher import fetch_readme, extract_links_from_text, fetch_page_title_and_description
-from services.scoring.database import get_cached_score, save_score
-
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY environment variable is not set")
-
-client = genai.Client(api_key=GEMINI_API_KEY)
+from services.scoring.database import get_cached_score, update_score
+from services.scoring.llm_gateway import generate_text
+from services.scoring.prompt_builder import PromptBuilder
+
+# Bump when a prompt template or the parsing of its reply changes, so cached replies are not reused.
+CRITERION_PROMPT_VERSION = "doc-criterion-1"
+STRUCTURED_PROMPT_VERSION = "doc-structured-1"
+
+# (name, description, README keywords, weight) for each documentation criterion
+DOCUMENTATION_CRITERIA = [
+    ("clarity", "clarity and understandability",
+     ["description", "overview", "summary", "introduction", "purpose"], 0.4),
+    ("examples", "examples and tutorials",
+     ["example", "tutorial", "sample", "quick start", "demo"], 0.3),
+    ("setup", "setup and installation instructions",
+     ["install", "setup", "configure", "prerequisite", "requirements"], 0.2),
+    ("license_contrib", "license and contribution guidelines",
+     ["license", "contributing", "contribution", "cla", "code of conduct"], 0.1),
+]
 
 def parse_score_from_text(text):
     match = re.search(r"(\d+(\.\d+)?)", text)
@@ -20,17 +32,53 @@ def parse_score_from_text(text):
     print("No numeric score found in Gemini response")
     return None
 
-def send_prompt_to_gemini(prompt):
+def send_prompt_to_gemini(prompt, repo=None):
+    """Score from one criterion prompt, or None if Gemini failed or gave no number."""
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
+        score = generate_text(prompt, CRITERION_PROMPT_VERSION, repo=repo, parse=parse_score_from_text)
         print("Received response from Gemini")
-        return parse_score_from_text(response.text)
+        return score
     except Exception as e:
         print(f"Error querying Gemini: {e}")
-        return 0
+        return None
+
+def parse_structured_scores(text, names):
+    """
+    Named scores from a JSON reply like {"clarity": 7, ...}. Returns None unless every name
+    maps to a number between 0 and 10, so the caller can fall back to per-criterion prompts.
+    """
+    text = (text or "").strip()
+    # Tolerate a ```json fenced block around the object
+    fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    try:
+        data = json.loads(text)
+    except ValueError:
+        print("Structured Gemini response is not valid JSON")
+        return None
+    if not isinstance(data, dict):
+        return None
+    scores = {}
+    for name in names:
+        value = data.get(name)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 10:
+            print(f"Structured Gemini response has no valid score for {name!r}: {value!r}")
+            return None
+        scores[name] = float(value)
+    return scores
+
+def send_structured_prompt_to_gemini(prompt, names, repo=None):
+    try:
+        scores = generate_text(
+            prompt, STRUCTURED_PROMPT_VERSION, options={"response_mime_type": "application/json"}, repo=repo,
+            parse=lambda text: parse_structured_scores(text, names),
+        )
+        print("Received structured response from Gemini")
+        return scores
+    except Exception as e:
+        print(f"Error querying Gemini: {e}")
+        return None
 
 def normalize_score(score, max_score=10):
     if score is None:
@@ -42,75 +90,92 @@ def normalize_score(score, max_score=10):
         return max_score
     return score
 
-def get_documentation_score(owner, repo_name):
+def build_structured_prompt(snippets):
+    """
+    One prompt covering every criterion, each with its own README snippet trimmed to the
+    section token budget, asking for JSON scores. Lines shared by several snippets appear once.
+    """
+    builder = PromptBuilder(
+        "You are an expert technical writer. Evaluate a project's README on the criteria below. "
+        "Each criterion comes with the README lines relevant to it. Score each from 0 (poor) to 10 (excellent) "
+        "and respond with only a JSON object mapping each criterion name to its numeric score, e.g. "
+        + json.dumps({name: 0 for name, _, _, _ in DOCUMENTATION_CRITERIA}) + ".\n"
+    )
+    for name, description, _, _ in DOCUMENTATION_CRITERIA:
+        builder.add_section(
+            f"### {name}: {description}", snippets[name], config.DOCUMENTATION_SECTION_TOKENS, dedupe=True
+        )
+    return builder.build()
+
+def build_criterion_prompt(description, snippet):
+    builder = PromptBuilder(
+        "You are an expert technical writer. Evaluate the following README snippet "
+        f"for {description}. Respond with a numeric score from 0 (poor) to 10 (excellent).\n\n"
+    )
+    builder.add_section("", snippet, config.DOCUMENTATION_SECTION_TOKENS)
+    return builder.build()
+
+def get_documentation_score(owner, repo_name, use_cache=True, context=None, default=0):
     """
     Comprehensive documentation score as weighted sum of:
     - Readme clarity (40%)
     - Examples/tutorials (30%)
     - Setup instructions (20%)
     - License & contribution guidelines (10%)
-    Each scored separately by Gemini using focused prompts on filtered README snippets.
+    All four are scored by Gemini in one structured request over filtered README snippets,
+    falling back to one focused prompt per criterion if the reply is malformed
+    (or always, with DOCUMENTATION_SINGLE_PROMPT=false).
+    With use_cache=False the cache is neither read nor written (used by background refreshes).
+    With a RepoContext, a README already fetched in this request is reused.
+    If Gemini fails or gives no usable score for a criterion, returns `default` without caching it.
     """
 
-    cached = get_cached_score(owner, repo_name)
+    cached = get_cached_score(owner, repo_name) if use_cache else None
     if cached and "documentation_score" in cached:
         print(f"Using cached documentation score for {owner}/{repo_name}: {cached['documentation_score']}")
         return cached["documentation_score"]
 
-    readme_content = fetch_readme(owner, repo_name)
+    readme_content = context.get_readme() if context is not None else fetch_readme(owner, repo_name)
     if not readme_content:
         print(f"No README content found for {owner}/{repo_name}")
         return 0
 
     lines = [line.strip() for line in readme_content.splitlines() if line.strip()]
 
+    # Prompt builders trim each section to its token budget
     def extract_section_by_keywords(keywords):
         snippet_lines = [line for line in lines if any(kw in line.lower() for kw in keywords)]
-        if snippet_lines:
-            return "\n".join(snippet_lines[:50])
-        return "\n".join(lines[:50])
-
-    clarity_keywords = ["description", "overview", "summary", "introduction", "purpose"]
-    examples_keywords = ["example", "tutorial", "sample", "quick start", "demo"]
-    setup_keywords = ["install", "setup", "configure", "prerequisite", "requirements"]
-    license_contrib_keywords = ["license", "contributing", "contribution", "cla", "code of conduct"]
-
-    prompt_template = (
-        "You are an expert technical writer. Evaluate the following README snippet "
-        "for {criterion_description}. Respond with a numeric score from 0 (poor) to 10 (excellent).\n\n"
-    )
+        return "\n".join(snippet_lines or lines)
 
-    clarity_snippet = extract_section_by_keywords(clarity_keywords)
-    examples_snippet = extract_section_by_keywords(examples_keywords)
-    setup_snippet = extract_section_by_keywords(setup_keywords)
-    license_contrib_snippet = extract_section_by_keywords(license_contrib_keywords)
+    snippets = {name: extract_section_by_keywords(keywords) for name, _, keywords, _ in DOCUMENTATION_CRITERIA}
 
-    clarity_score = normalize_score(
-        send_prompt_to_gemini(prompt_template.format(criterion_description="clarity and understandability") + clarity_snippet)
-    )
-    examples_score = normalize_score(
-        send_prompt_to_gemini(prompt_template.format(criterion_description="examples and tutorials") + examples_snippet)
-    )
-    setup_score = normalize_score(
-        send_prompt_to_gemini(prompt_template.format(criterion_description="setup and installation instructions") + setup_snippet)
-    )
-    license_contrib_score = normalize_score(
-        send_prompt_to_gemini(prompt_template.format(criterion_description="license and contribution guidelines") + license_contrib_snippet)
-    )
-
-    print(f"Documentation sub-scores for {owner}/{repo_name}: clarity={clarity_score}, examples={examples_score}, setup={setup_score}, license/contrib={license_contrib_score}")
-
-    combined_score = (
-        0.4 * clarity_score +
-        0.3 * examples_score +
-        0.2 * setup_score +
-        0.1 * license_contrib_score
-    )
+    scores = None
+    if config.DOCUMENTATION_SINGLE_PROMPT:
+        scores = send_structured_prompt_to_gemini(
+            build_structured_prompt(snippets), [name for name, _, _, _ in DOCUMENTATION_CRITERIA],
+            repo=f"{owner}/{repo_name}",
+        )
+        if scores is None:
+            print(f"Falling back to per-criterion documentation prompts for {owner}/{repo_name}")
+
+    if scores is None:
+        scores = {
+            name: send_prompt_to_gemini(build_criterion_prompt(description, snippets[name]), repo=f"{owner}/{repo_name}")
+            for name, description, _, _ in DOCUMENTATION_CRITERIA
+        }
+    failed = [name for name, score in scores.items() if score is None]
+    if failed:
+        print(f"Documentation scoring failed for {owner}/{repo_name} ({', '.join(failed)}); returning {default}")
+        return default
+    scores = {name: normalize_score(score) for name, score in scores.items()}
+
+    print(f"Documentation sub-scores for {owner}/{repo_name}: clarity={scores['clarity']}, examples={scores['examples']}, setup={scores['setup']}, license/contrib={scores['license_contrib']}")
+
+    combined_score = sum(weight * scores[name] for name, _, _, weight in DOCUMENTATION_CRITERIA)
     combined_score = round(combined_score, 2)
 
-    cached = cached or {}
-    cached["documentation_score"] = combined_score
-    save_score(owner, repo_name, cached)
-    print(f"Saved documentation score for {owner}/{repo_name}: {combined_score}")
+    if use_cache:
+        update_score(owner, repo_name, {"documentation_score": combined_score})
+        print(f"Saved documentation score for {owner}/{repo_name}: {combined_score}")
 
     return combined_score
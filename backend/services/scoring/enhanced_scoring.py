@@ -1,94 +1,275 @@
-from typing import List, Dict
-from services.ingest.repo_fetcher import fetch_repo_data, fetch_code_snippets, fetch_contributors_with_locations
-from services.scoring.maintenance import calculate_category_1_score
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Event
+from typing import Callable, List, Dict, Optional
+from services.scoring import config
+from services.ingest.repo_fetcher import fetch_repo_data_batch
+from services.ingest.repo_context import RepoContext
+from services.scoring.maintenance import (
+    calculate_category_1_score,
+    calculate_category_1_scores_batch,
+    maintenance_columns,
+)
 from services.scoring.community import calculate_category_3_score
 from services.scoring.documentation import get_documentation_score
 from services.ingest.ecosyste_client import get_aggregated_code_quality_score
+from services.scoring.singleflight import scoring_flight, flight_key
+from services.scoring.static_quality import estimate_code_quality
 
 
-def batch_score_repositories(repos: List[Dict]) -> List[Dict]:
-    scored_repos = []
-    print(f"Starting batch scoring of {len(repos[:100])} repositories (top 100)", flush=True)
+_github_slots = BoundedSemaphore(config.BATCH_GITHUB_CONCURRENCY)
+_llm_slots = BoundedSemaphore(config.BATCH_LLM_CONCURRENCY)
+_snippet_slots = BoundedSemaphore(config.STATIC_QUALITY_FETCH_CONCURRENCY)
 
-    for idx, repo in enumerate(repos[:100], start=1):
-        full_name = repo.get("full_name") or f"{repo.get('owner')}/{repo.get('name')}"
-        print(f"[{idx}/{min(100, len(repos))}] Scoring maintenance and community for {full_name}...", flush=True)
 
-        try:
-            # Fetch detailed repo data for scoring
-            full_repo_data = fetch_repo_data(repo["owner"], repo["name"])
-            if not full_repo_data:
+def _batch_maintenance_scores(top, snapshots):
+    """
+    Maintenance scores of every repo with a batched snapshot, in one columnar pass
+    (repo full name -> score). Repos missing here are scored one by one in _score_basics.
+    """
+    contexts = []
+    for repo in top:
+        snapshot = snapshots.get(f"{repo['owner']}/{repo['name']}")
+        if snapshot:
+            ctx = RepoContext.from_search_item(repo)
+            ctx.set_snapshot(snapshot)
+            contexts.append(ctx)
+    if not contexts:
+        return {}
+    scores = calculate_category_1_scores_batch(**maintenance_columns([ctx.maintenance_inputs() for ctx in contexts]))
+    return dict(zip((ctx.full_name for ctx in contexts), scores["maintenance_score"].tolist()))
+
+
+def _score_basics(idx, total, repo, snapshot, maintenance_score=None):
+    """
+    Maintenance, community and (within the first STATIC_QUALITY_MAX_REPOS) a static code-quality
+    estimate for one search result; None if the repo cannot be fetched. maintenance_score,
+    if given, comes from _batch_maintenance_scores.
+    """
+    ctx = RepoContext.from_search_item(repo)
+    full_name = repo.get("full_name") or ctx.full_name
+    print(f"[{idx}/{total}] Scoring maintenance and community for {full_name}...", flush=True)
+
+    # Repos whose batched snapshot failed are fetched individually by get_snapshot()
+    if snapshot:
+        ctx.set_snapshot(snapshot)
+
+    try:
+        with _github_slots:
+            if not ctx.get_snapshot():
                 print(f"  Warning: fetch_repo_data returned None for {full_name}, skipping", flush=True)
-                continue
-
-            score_input = {
-                "pushedAt": full_repo_data.get("pushedAt") or full_repo_data.get("pushed_at") or "",
-                "commitCountLast90Days": full_repo_data.get("commitCountLast90Days") or 0,
-                "totalCommitCount": full_repo_data.get("totalCommitCount") or 0,
-                "pullRequests": full_repo_data.get("pullRequests", {}),
-                "issues": full_repo_data.get("issues", {}),
-                "ciPresent": full_repo_data.get("ciPresent", True),
-                "testCoveragePercent": full_repo_data.get("testCoveragePercent", 80),
-            }
-            print(f"  Normalized maintenance inputs for {full_name}: pushedAt={score_input['pushedAt']}, last90={score_input['commitCountLast90Days']}, total={score_input['totalCommitCount']}", flush=True)
+                return None
 
+        maint_score = maintenance_score
+        if maint_score is None:
+            score_input = ctx.maintenance_inputs()
+            print(f"  Normalized maintenance inputs for {full_name}: pushedAt={score_input['pushedAt']}, last90={score_input['commitCountLast90Days']}, total={score_input['totalCommitCount']}", flush=True)
             maint_score = calculate_category_1_score(score_input)
+        with _github_slots:
+            comm_score = scoring_flight.do(
+                flight_key(ctx.owner, ctx.name, "community"),
+                calculate_category_3_score, ctx.owner, ctx.name, context=ctx,
+            )
 
-            contributors = fetch_contributors_with_locations(repo["owner"], repo["name"])
-            comm_score = calculate_category_3_score(repo["owner"], repo["name"], contributors)
+        print(f"  Maintenance: {maint_score}, Community: {comm_score}", flush=True)
+    except Exception as e:
+        print(f"  Error scoring maintenance/community for {full_name}: {e}", flush=True)
+        maint_score, comm_score = 0, 0
 
-            print(f"  Maintenance: {maint_score}, Community: {comm_score}", flush=True)
+    static_quality = {"score": None, "confidence": 0.0}
+    if idx <= config.STATIC_QUALITY_MAX_REPOS:
+        try:
+            with _snippet_slots:
+                snippets = ctx.get_snippets()
+            static_quality = estimate_code_quality(snippets)
+            print(f"  Static code quality: {static_quality['score']} (confidence {static_quality['confidence']})", flush=True)
         except Exception as e:
-            print(f"  Error scoring maintenance/community for {full_name}: {e}", flush=True)
-            maint_score, comm_score = 0, 0
-
-        scored_repos.append({
-            "repo": full_name,
-            "owner": repo["owner"],
-            "repo_name": repo["name"],
-            "maintenance_score": maint_score,
-            "community_score": comm_score,
-            "documentation_score": None,
-            "code_quality_score": None,
-            "combined_score": 0,
-            "good_first_issues_count": repo.get("good_first_issues_count", 0),
-            "pushedAt": score_input.get("pushedAt", ""),
-            "topics": repo.get("topics", []),
-        })
+            print(f"  Error estimating code quality for {full_name}: {e}", flush=True)
+
+    return ctx, {
+        "repo": full_name,
+        "owner": ctx.owner,
+        "repo_name": ctx.name,
+        "maintenance_score": maint_score,
+        "community_score": comm_score,
+        "documentation_score": None,
+        "code_quality_score": static_quality["score"],
+        "code_quality_source": "static" if static_quality["score"] is not None else None,
+        "code_quality_confidence": static_quality["confidence"],
+        "combined_score": 0,
+        "good_first_issues_count": ctx.good_first_issues_count or 0,
+        "pushedAt": ctx.pushed_at or "",
+        "topics": ctx.topics or [],
+    }
+
+
+def _needs_llm_code_quality(r, contender):
+    return (
+        contender
+        or r["code_quality_score"] is None
+        or r["code_quality_confidence"] < config.STATIC_QUALITY_MIN_CONFIDENCE
+    )
+
+
+def _code_quality_contenders(detail_tier):
+    """Repos of the top tier whose provisional score puts them in the top CODE_QUALITY_LLM_TOP_RANKS."""
+    ranked = sorted(detail_tier, key=_basic_combined_score, reverse=True)
+    return {r["repo"] for r in ranked[:config.CODE_QUALITY_LLM_TOP_RANKS]}
+
+
+def _score_details(i, r, ctx, contender):
+    """
+    Documentation and code quality for one top-tier repo. Code quality keeps the static
+    estimate unless the repo is a contender for the top ranks or the estimate is uncertain.
+    Failures score 0, except code quality falls back to the static estimate.
+    """
+    print(f"[{i}/15] Scoring documentation and code quality for {r['repo']}...", flush=True)
+    static_score = r["code_quality_score"]
+    source = "static"
+    needs_llm = _needs_llm_code_quality(r, contender)
+    try:
+        # GitHub inputs are loaded into the context first so LLM slots only cover Gemini calls
+        with _github_slots:
+            ctx.get_readme()
+            if needs_llm:
+                ctx.get_snippets()
+        with _llm_slots:
+            # Same flight as the single-repo pipeline, which needs None on failure
+            doc_score = scoring_flight.do(
+                flight_key(ctx.owner, ctx.name, "documentation"),
+                get_documentation_score, ctx.owner, ctx.name, context=ctx, default=None,
+            )
+            if doc_score is None:
+                doc_score = 0
+            code_quality_score = None
+            if needs_llm:
+                code_quality_score = scoring_flight.do(
+                    flight_key(ctx.owner, ctx.name, "code_quality"),
+                    lambda: get_aggregated_code_quality_score(ctx.get_snippets(), ctx.owner, ctx.name, default=None),
+                )
+                if code_quality_score is not None:
+                    source = "llm"
+                else:
+                    print(f"  Gemini code quality failed for {r['repo']}, keeping static estimate", flush=True)
+            if code_quality_score is None:
+                code_quality_score = static_score or 0
+        print(f"  Documentation: {doc_score}, Code Quality: {code_quality_score} ({source})", flush=True)
+    except Exception as e:
+        print(f"  Error scoring doc/code quality for {r['repo']}: {e}", flush=True)
+        doc_score, code_quality_score = 0, static_score or 0
+    return doc_score, code_quality_score, source
+
+
+def _basic_combined_score(r):
+    return round(
+        0.6 * r["maintenance_score"] +
+        0.4 * r["community_score"],
+        2
+    )
+
+
+def _detail_combined_score(r, doc_score, code_quality_score):
+    return round(
+        0.4 * r["maintenance_score"] +
+        0.25 * r["community_score"] +
+        0.25 * code_quality_score +
+        0.10 * doc_score,
+        2
+    )
+
+
+def batch_score_repositories(
+    repos: List[Dict],
+    on_event: Optional[Callable[[str, Dict], None]] = None,
+    cancelled: Optional[Event] = None,
+) -> List[Dict]:
+    """
+    Score search results: maintenance, community and a static code-quality estimate for the
+    top 100, plus documentation and (where the estimate is not good enough) Gemini code quality
+    for the top 15. Each repo's fields travel in a RepoContext seeded from the
+    search item and a batched snapshot, so nothing already fetched is fetched again.
+    Both phases run on bounded thread pools; results keep the input order before the final sort.
+
+    on_event, if given, is called from worker threads as results arrive:
+    ("repo", result) once a repo's maintenance and community scores are in (combined_score is
+    provisional), ("failed", {"repo": ...}) for a repo that could not be fetched,
+    ("patch", fields) when a top-tier repo gets documentation and code quality,
+    and ("ranking", results) with the final sorted list.
+
+    Once `cancelled` is set, repos not yet started are skipped and an empty list is returned
+    without a ranking event.
+    """
+    top = repos[:100]
+    print(f"Starting batch scoring of {len(top)} repositories (top 100)", flush=True)
+    snapshots = fetch_repo_data_batch([(repo["owner"], repo["name"]) for repo in top])
+    maintenance_scores = _batch_maintenance_scores(top, snapshots)
+
+    def stopped():
+        return cancelled is not None and cancelled.is_set()
+
+    def basics_for(idx, repo):
+        if stopped():
+            return None
+        key = f"{repo['owner']}/{repo['name']}"
+        scored = _score_basics(idx, len(top), repo, snapshots.get(key), maintenance_score=maintenance_scores.get(key))
+        if on_event:
+            if scored:
+                _, r = scored
+                on_event("repo", dict(r, combined_score=_basic_combined_score(r)))
+            else:
+                on_event("failed", {"repo": repo.get("full_name") or f"{repo['owner']}/{repo['name']}"})
+        return scored
+
+    def details_for(i, r, ctx, contender):
+        if stopped():
+            return None
+        doc_score, code_quality_score, source = _score_details(i, r, ctx, contender)
+        if on_event:
+            on_event("patch", {
+                "repo": r["repo"],
+                "documentation_score": doc_score,
+                "code_quality_score": code_quality_score,
+                "code_quality_source": source,
+                "combined_score": _detail_combined_score(r, doc_score, code_quality_score),
+            })
+        return doc_score, code_quality_score, source
+
+    with ThreadPoolExecutor(max_workers=config.BATCH_BASIC_WORKERS) as executor:
+        futures = [executor.submit(basics_for, idx, repo) for idx, repo in enumerate(top, start=1)]
+        basics = [f.result() for f in futures]
+    basics = [b for b in basics if b is not None]
+    contexts = [ctx for ctx, _ in basics]
+    scored_repos = [r for _, r in basics]
+    if stopped():
+        print("Batch scoring cancelled after maintenance and community", flush=True)
+        return []
 
     print("Scoring documentation and code quality for top 15 repositories", flush=True)
-    for i, r in enumerate(scored_repos[:15], start=1):
-        print(f"[{i}/15] Scoring documentation and code quality for {r['repo']}...", flush=True)
-        try:
-            doc_score = get_documentation_score(r["owner"], r["repo_name"])
-            snippets = fetch_code_snippets(r["owner"], r["repo_name"])
-            code_quality_score = get_aggregated_code_quality_score(snippets, r["owner"], r["repo_name"])
-            print(f"  Documentation: {doc_score}, Code Quality: {code_quality_score}", flush=True)
-        except Exception as e:
-            print(f"  Error scoring doc/code quality for {r['repo']}: {e}", flush=True)
-            doc_score, code_quality_score = 0, 0
+    contenders = _code_quality_contenders(scored_repos[:15])
+    with ThreadPoolExecutor(max_workers=config.BATCH_DETAIL_WORKERS) as executor:
+        futures = [
+            executor.submit(details_for, i, r, ctx, r["repo"] in contenders)
+            for i, (r, ctx) in enumerate(zip(scored_repos[:15], contexts[:15]), start=1)
+        ]
+        details = [f.result() for f in futures]
+    if stopped():
+        print("Batch scoring cancelled after documentation and code quality", flush=True)
+        return []
 
+    for r, (doc_score, code_quality_score, source) in zip(scored_repos[:15], details):
         r["documentation_score"] = doc_score
         r["code_quality_score"] = code_quality_score
-        r["combined_score"] = round(
-            0.4 * r["maintenance_score"] +
-            0.25 * r["community_score"] +
-            0.25 * code_quality_score +
-            0.10 * doc_score,
-            2
-        )
+        r["code_quality_source"] = source
+        r["combined_score"] = _detail_combined_score(r, doc_score, code_quality_score)
 
     print("Calculating combined score for remaining repositories (16-100)", flush=True)
     for r in scored_repos[15:]:
-        r["combined_score"] = round(
-            0.6 * r["maintenance_score"] +
-            0.4 * r["community_score"],
-            2
-        )
+        r["combined_score"] = _basic_combined_score(r)
 
     print("Sorting repositories by combined score", flush=True)
     scored_repos.sort(key=lambda x: x["combined_score"], reverse=True)
 
+    if on_event:
+        on_event("ranking", scored_repos)
     print("Batch scoring complete", flush=True)
     return scored_repos
 
@@ -0,0 +1,185 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from services.scoring import config
+from services.scoring.database import (
+    COMPONENT_KEYS,
+    LEGACY_COMPONENT_ALIASES,
+    get_cached_score,
+    modify_score,
+    stamp_components,
+)
+from services.ingest.repo_context import RepoContext
+from services.ingest.ecosyste_client import get_aggregated_code_quality_score
+from services.scoring.maintenance import calculate_category_1_score
+from services.scoring.community import calculate_category_3_score
+from services.scoring.documentation import get_documentation_score
+from services.scoring.summary import summarize_scores
+
+_executor = ThreadPoolExecutor(max_workers=config.REFRESH_WORKERS, thread_name_prefix="score-refresh")
+_in_flight = set()
+_in_flight_lock = Lock()
+
+
+def _component_value(entry, component):
+    if component in entry:
+        return entry[component]
+    for legacy, canonical in LEGACY_COMPONENT_ALIASES.items():
+        if canonical == component and legacy in entry:
+            return entry[legacy]
+    return None
+
+
+def stale_components(entry, now=None):
+    """
+    Components present in a cached entry whose TTL has expired.
+    Entries written before per-component timestamps existed count as expired.
+    """
+    now = now if now is not None else time.time()
+    stamps = entry.get("component_updated_at") or {}
+    stale = []
+    for component, ttl in config.COMPONENT_TTL_SECONDS.items():
+        if _component_value(entry, component) is None:
+            continue
+        if now - stamps.get(component, 0) >= ttl:
+            stale.append(component)
+    return stale
+
+
+def component_inputs(snapshot, components=None):
+    """
+    The inputs each component score depends on, taken from a fetch_repo_data snapshot.
+    Maintenance has none: its recency term decays with time, so it is always recomputed
+    (cheaply, from the snapshot itself). With `components`, only those are included: record
+    inputs just for components that actually scored, or a failed score would look up to date.
+    """
+    inputs = {
+        "community_engagement_score": {
+            "pushedAt": snapshot.get("pushedAt"),
+            "issueCount": snapshot.get("issueCount"),
+            "pullRequestCount": snapshot.get("pullRequestCount"),
+        },
+        "documentation_score": {"readmeSha": snapshot.get("readmeSha")},
+        "code_quality_score": {"snippetShas": snapshot.get("snippetShas") or []},
+    }
+    if components is None:
+        return inputs
+    return {c: value for c, value in inputs.items() if c in components}
+
+
+def _score_maintenance(ctx):
+    if not ctx.get_snapshot():
+        raise ValueError(f"Repository {ctx.full_name} not found or inaccessible.")
+    return calculate_category_1_score(ctx.get_snapshot())
+
+
+# Recompute one component from scratch, bypassing the score cache. LLM scorers return None
+# when Gemini fails, so a transient outage leaves the cached value stale instead of zeroing it.
+COMPONENT_SCORERS = {
+    "maintenance_score": _score_maintenance,
+    "community_engagement_score": lambda ctx: calculate_category_3_score(ctx.owner, ctx.name, context=ctx),
+    "documentation_score": lambda ctx: get_documentation_score(
+        ctx.owner, ctx.name, use_cache=False, context=ctx, default=None
+    ),
+    "code_quality_score": lambda ctx: get_aggregated_code_quality_score(
+        ctx.get_snippets(), repo_key=ctx.full_name, default=None
+    ),
+}
+
+
+def _apply_refresh(entry, values, revalidated, inputs, now):
+    entry.update(values)
+    if "maintenance_score" in values and "score_category_1" in entry:
+        entry["score_category_1"] = values["maintenance_score"]
+    stamp_components(entry, list(values) + list(revalidated), now)
+    if inputs:
+        # Only components that scored (or were confirmed unchanged) get their inputs recorded
+        stored_inputs = dict(entry.get("component_inputs") or {})
+        stored_inputs.update({c: inputs[c] for c in list(values) + list(revalidated) if c in inputs})
+        entry["component_inputs"] = stored_inputs
+
+    scores = [_component_value(entry, c) for c in COMPONENT_KEYS]
+    if "combined_score" in entry and all(s is not None for s in scores):
+        maintenance, community, documentation, code_quality = scores
+        combined_score, highlights, special_mentions = summarize_scores(
+            maintenance, code_quality, community, documentation
+        )
+        entry["combined_score"] = combined_score
+        entry["top_highlights"] = highlights
+        entry["special_mentions"] = special_mentions
+    return entry
+
+
+def refresh_components(owner, repo_name, components, entry=None):
+    """
+    Bring the given components of a cached entry up to date and swap them in with one transaction.
+    A single snapshot query decides which components actually need rescoring: components whose
+    recorded inputs (README blob SHA, snippet file SHAs, pushedAt/issue/PR counts) are unchanged
+    are only re-stamped.
+    """
+    ctx = RepoContext(owner, repo_name)
+    try:
+        snapshot = ctx.get_snapshot()
+    except Exception as e:
+        print(f"Snapshot fetch failed for {owner}/{repo_name}: {e}", flush=True)
+        snapshot = None
+    inputs = component_inputs(snapshot) if snapshot else {}
+    stored_inputs = (entry or {}).get("component_inputs") or {}
+
+    values = {}
+    revalidated = []
+    for component in components:
+        if component in inputs and stored_inputs.get(component) == inputs[component]:
+            revalidated.append(component)
+            continue
+        try:
+            value = COMPONENT_SCORERS[component](ctx)
+        except Exception as e:
+            print(f"Background refresh of {component} failed for {owner}/{repo_name}: {e}", flush=True)
+            continue
+        if value is None:
+            print(f"Background refresh of {component} got no score for {owner}/{repo_name}; keeping it stale", flush=True)
+            continue
+        values[component] = value
+
+    if values or revalidated:
+        now = time.time()
+        modify_score(owner, repo_name, lambda e: _apply_refresh(e, values, revalidated, inputs, now))
+        print(f"Refreshed {sorted(values)}, unchanged {sorted(revalidated)} for {owner}/{repo_name}", flush=True)
+    return values
+
+
+def rescore_repo(owner, repo_name):
+    """Re-run every cached component of a repo whose inputs changed since it was scored."""
+    entry = get_cached_score(owner, repo_name) or {}
+    components = [c for c in COMPONENT_KEYS if _component_value(entry, c) is not None]
+    return refresh_components(owner, repo_name, components or list(COMPONENT_KEYS), entry)
+
+
+def _run_refresh(key, owner, repo_name, components, entry):
+    try:
+        refresh_components(owner, repo_name, components, entry)
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(key)
+
+
+def schedule_refresh(owner, repo_name, entry):
+    """
+    Stale-while-revalidate: if any component of a served entry has expired,
+    recompute just those components in the background. Returns True if a refresh was queued.
+    """
+    components = stale_components(entry)
+    if not components:
+        return False
+
+    key = f"{owner}/{repo_name}"
+    with _in_flight_lock:
+        if key in _in_flight:
+            return False
+        _in_flight.add(key)
+
+    print(f"Serving stale {components} for {key}; refreshing in background", flush=True)
+    _executor.submit(_run_refresh, key, owner, repo_name, components, entry)
+    return True
@@ -0,0 +1,197 @@
+import json
+import sqlite3
+import time
+import uuid
+from threading import local
+
+from services.scoring import config
+
+
+class JobStore:
+    """
+    SQLite store for search-and-score jobs and their per-repo results.
+    Results are written as they arrive, so partial work is readable while a job runs
+    and survives a restart.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = local()
+        self._init_schema()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=config.SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " owner TEXT,"
+            " filters TEXT NOT NULL,"
+            " total INTEGER,"
+            " failed INTEGER NOT NULL DEFAULT 0,"
+            " error TEXT,"
+            " created_at REAL NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS job_results ("
+            " job_id TEXT NOT NULL,"
+            " repo TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " detailed INTEGER NOT NULL DEFAULT 0,"
+            " rank INTEGER,"
+            " PRIMARY KEY (job_id, repo))"
+        )
+
+    def create(self, filters, owner=None):
+        """New queued job; owner identifies the process running it (see heartbeat)."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, owner, filters, created_at, updated_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, owner, json.dumps(filters), now, now),
+        )
+        return job_id
+
+    def heartbeat(self, owner, now=None):
+        """Refresh updated_at on every unfinished job owned by `owner`, showing it is still alive."""
+        cursor = self._connect().execute(
+            "UPDATE jobs SET updated_at = ? WHERE owner = ? AND status IN ('queued', 'running')",
+            (now if now is not None else time.time(), owner),
+        )
+        return cursor.rowcount
+
+    def active_jobs(self, owner):
+        """Ids of queued or running jobs still owned by `owner`; any other job it runs should stop."""
+        rows = self._connect().execute(
+            "SELECT id FROM jobs WHERE owner = ? AND status IN ('queued', 'running')", (owner,)
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def set_status(self, job_id, status, total=None, error=None):
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, total = COALESCE(?, total), error = COALESCE(?, error), updated_at = ? "
+            "WHERE id = ?",
+            (status, total, error, time.time(), job_id),
+        )
+
+    def record_failure(self, job_id):
+        self._connect().execute(
+            "UPDATE jobs SET failed = failed + 1, updated_at = ? WHERE id = ?", (time.time(), job_id)
+        )
+
+    def put_result(self, job_id, repo, data):
+        self._connect().execute(
+            "INSERT INTO job_results (job_id, repo, data) VALUES (?, ?, ?) "
+            "ON CONFLICT(job_id, repo) DO UPDATE SET data = excluded.data",
+            (job_id, repo, json.dumps(data)),
+        )
+
+    def patch_result(self, job_id, repo, fields):
+        """Merge top-tier fields (documentation, code quality, combined score) into a stored result."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM job_results WHERE job_id = ? AND repo = ?", (job_id, repo)
+            ).fetchone()
+            data = json.loads(row[0]) if row else {"repo": repo}
+            data.update(fields)
+            conn.execute(
+                "INSERT INTO job_results (job_id, repo, data, detailed) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT(job_id, repo) DO UPDATE SET data = excluded.data, detailed = 1",
+                (job_id, repo, json.dumps(data)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def finish(self, job_id, ranking):
+        """Store the final sorted results and mark the job done, in one transaction."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO job_results (job_id, repo, data, rank) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_id, repo) DO UPDATE SET data = excluded.data, rank = excluded.rank",
+                [(job_id, r["repo"], json.dumps(r), rank) for rank, r in enumerate(ranking, start=1)],
+            )
+            conn.execute(
+                "UPDATE jobs SET status = 'done', total = COALESCE(total, ?), updated_at = ? WHERE id = ?",
+                (len(ranking), time.time(), job_id),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def interrupt_stale(self, max_age, now=None):
+        """
+        Mark queued or running jobs whose heartbeat is older than max_age seconds as interrupted:
+        their process died. Jobs of live processes, in any worker, are left alone; partial
+        results of interrupted jobs stay readable.
+        """
+        now = now if now is not None else time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'interrupted', updated_at = ? "
+            "WHERE status IN ('queued', 'running') AND updated_at < ?",
+            (now, now - max_age),
+        )
+        return cursor.rowcount
+
+    def get(self, job_id):
+        """Job status and progress counts, or None for an unknown id."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT status, filters, total, failed, error, created_at, updated_at FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if not row:
+            return None
+        status, filters, total, failed, error, created_at, updated_at = row
+        done, detailed = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(detailed), 0) FROM job_results WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        in_flight = max((total or 0) - done - failed, 0) if status == "running" else 0
+        return {
+            "job_id": job_id,
+            "status": status,
+            "filters": json.loads(filters),
+            "progress": {
+                "total": total,
+                "done": done,
+                "in_flight": in_flight,
+                "failed": failed,
+                "detailed": detailed,
+            },
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def results(self, job_id):
+        """Final ranking once the job is done; otherwise partial results by provisional combined score."""
+        rows = self._connect().execute(
+            "SELECT data, rank FROM job_results WHERE job_id = ?", (job_id,)
+        ).fetchall()
+        results = [(json.loads(data), rank) for data, rank in rows]
+        if results and all(rank is not None for _, rank in results):
+            results.sort(key=lambda item: item[1])
+        else:
+            results.sort(key=lambda item: item[0].get("combined_score") or 0, reverse=True)
+        return [data for data, _ in results]
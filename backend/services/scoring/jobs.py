@@ -0,0 +1,114 @@
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+
+from services.scoring import config
+from services.scoring.job_store import JobStore
+from services.scoring.enhanced_scoring import batch_score_repositories
+
+_store = None
+_store_lock = Lock()
+_executor = ThreadPoolExecutor(max_workers=config.SCORE_JOB_WORKERS, thread_name_prefix="score-job")
+# Identifies this process's jobs; unique across hosts, workers and restarts.
+JOB_OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+_heartbeat_stop = Event()
+# job_id -> Event set once the job must stop (marked interrupted or taken over by another process)
+_cancel_events = {}
+_cancel_lock = Lock()
+
+
+def _interrupt_stale_jobs(store):
+    interrupted = store.interrupt_stale(config.SCORE_JOB_STALE_SECONDS)
+    if interrupted:
+        print(f"Marked {interrupted} stale scoring jobs as interrupted", flush=True)
+
+
+def _cancel_orphaned_jobs(store):
+    """Stop jobs running here that the store no longer lists as this process's unfinished jobs."""
+    with _cancel_lock:
+        running = dict(_cancel_events)
+    if not running:
+        return
+    active = store.active_jobs(JOB_OWNER)
+    for job_id, cancelled in running.items():
+        if job_id not in active and not cancelled.is_set():
+            print(f"Job {job_id} is no longer owned by this process; cancelling", flush=True)
+            cancelled.set()
+
+
+def _heartbeat_loop(store):
+    """Keep this process's jobs fresh and sweep up jobs left behind by dead processes."""
+    while not _heartbeat_stop.wait(config.SCORE_JOB_HEARTBEAT_SECONDS):
+        try:
+            store.heartbeat(JOB_OWNER)
+            _interrupt_stale_jobs(store)
+            _cancel_orphaned_jobs(store)
+        except Exception as e:
+            print(f"Scoring job heartbeat failed: {e}", flush=True)
+
+
+def get_job_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore(config.SCORE_JOB_DB_PATH)
+                _interrupt_stale_jobs(_store)
+                Thread(target=_heartbeat_loop, args=(_store,), name="score-job-heartbeat", daemon=True).start()
+    return _store
+
+
+def _record_event(job_id, event, data, cancelled):
+    if cancelled.is_set():
+        # Whoever took the job over owns its rows now
+        return
+    store = get_job_store()
+    if event == "repo":
+        store.put_result(job_id, data["repo"], data)
+    elif event == "patch":
+        store.patch_result(job_id, data["repo"], data)
+    elif event == "failed":
+        store.record_failure(job_id)
+    elif event == "ranking":
+        store.finish(job_id, data)
+
+
+def _run_job(job_id, search):
+    store = get_job_store()
+    cancelled = Event()
+    with _cancel_lock:
+        _cancel_events[job_id] = cancelled
+    try:
+        store.set_status(job_id, "running")
+        repos = search()
+        if cancelled.is_set():
+            return
+        store.set_status(job_id, "running", total=min(len(repos), 100))
+        print(f"Job {job_id}: scoring {len(repos)} repos", flush=True)
+        if not repos:
+            store.finish(job_id, [])
+            return
+        batch_score_repositories(
+            repos, on_event=lambda event, data: _record_event(job_id, event, data, cancelled), cancelled=cancelled
+        )
+        if cancelled.is_set():
+            print(f"Job {job_id} cancelled", flush=True)
+    except Exception as e:
+        print(f"Job {job_id} failed: {e}", flush=True)
+        if not cancelled.is_set():
+            store.set_status(job_id, "failed", error=str(e))
+    finally:
+        with _cancel_lock:
+            _cancel_events.pop(job_id, None)
+
+
+def submit_job(filters, search):
+    """
+    Queue a search-and-score job and return its id right away.
+    `search` is called on the job thread and returns the repos to score.
+    """
+    job_id = get_job_store().create(filters, owner=JOB_OWNER)
+    _executor.submit(_run_job, job_id, search)
+    return job_id
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import sqlite3
+import time
+from threading import Lock, local
+
+from services.scoring import config
+
+_PRUNE_EVERY_WRITES = 200
+
+
+class LLMResponseCache:
+    """
+    Content-addressed on-disk store of LLM replies.
+    Keys hash the model, the prompt template version and the full prompt, so a reply is
+    reused for any repo that produces the same prompt; bump the template version whenever
+    a prompt or the parsing of its reply changes. Least recently used entries are evicted
+    beyond max_entries.
+    """
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = local()
+        self._stats_lock = Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.prompt_tokens_saved = 0
+        self.output_tokens_saved = 0
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " template TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+            " output_tokens INTEGER NOT NULL DEFAULT 0,"
+            " accessed_at REAL NOT NULL)"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=config.SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model, template_version, prompt, options=None):
+        raw = json.dumps([model, template_version, prompt, options or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT response, prompt_tokens, output_tokens FROM llm_responses WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            with self._stats_lock:
+                self.misses += 1
+            return None
+        response, prompt_tokens, output_tokens = row
+        conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        with self._stats_lock:
+            self.hits += 1
+            self.prompt_tokens_saved += prompt_tokens
+            self.output_tokens_saved += output_tokens
+        return response
+
+    def put(self, key, model, template_version, response, prompt_tokens=0, output_tokens=0):
+        self._connect().execute(
+            "INSERT OR REPLACE INTO llm_responses "
+            "(key, model, template, response, prompt_tokens, output_tokens, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, model, template_version, response, prompt_tokens or 0, output_tokens or 0, time.time()),
+        )
+        with self._stats_lock:
+            self._writes += 1
+            prune = self._writes % _PRUNE_EVERY_WRITES == 0
+        if prune:
+            self._prune()
+
+    def _prune(self):
+        conn = self._connect()
+        (count,) = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def stats(self):
+        (entries,) = self._connect().execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "prompt_tokens_saved": self.prompt_tokens_saved,
+                "output_tokens_saved": self.output_tokens_saved,
+            }
+
+
+_cache = None
+_cache_lock = Lock()
+
+
+def get_llm_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(config.LLM_CACHE_PATH, config.LLM_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def llm_cache_stats():
+    if not config.LLM_CACHE_ENABLED:
+        return {"enabled": False}
+    return dict(get_llm_cache().stats(), enabled=True)
+
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import random
+import time
+from threading import BoundedSemaphore, Lock
+
+import httpx
+from google import genai
+from google.genai import errors
+
+from services.scoring import config
+from services.scoring.llm_cache import LLMResponseCache, get_llm_cache
+from services.scoring.llm_usage import get_usage_ledger
+from services.scoring.prompt_builder import count_tokens
+
+_client = None
+_client_lock = Lock()
+_slots = BoundedSemaphore(config.LLM_MAX_CONCURRENCY)
+
+
+def get_client():
+    """The shared Gemini client, created on first use so modules import without GEMINI_API_KEY."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    raise RuntimeError("GEMINI_API_KEY environment variable is not set")
+                _client = genai.Client(
+                    api_key=api_key,
+                    http_options={"timeout": int(config.LLM_TIMEOUT_SECONDS * 1000)},
+                )
+    return _client
+
+
+def set_client(client):
+    """Swap the Gemini client (e.g. for tests)."""
+    global _client
+    with _client_lock:
+        _client = client
+
+
+def is_retryable(error):
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or (error.code or 0) >= 500
+    return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+    return random.uniform(0, min(config.LLM_MAX_BACKOFF_SECONDS, config.LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _call_with_retries(model, prompt, options):
+    kwargs = {"config": options} if options else {}
+    attempt = 0
+    while True:
+        try:
+            with _slots:
+                return get_client().models.generate_content(model=model, contents=prompt, **kwargs)
+        except Exception as e:
+            if attempt >= config.LLM_MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt)
+            attempt += 1
+            print(f"Gemini request failed ({e}); retry {attempt}/{config.LLM_MAX_RETRIES} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def _record_usage(repo, template_version, **usage):
+    """Usage accounting is best-effort: a ledger failure must not cost the reply."""
+    try:
+        get_usage_ledger().record(repo, template_version, **usage)
+    except Exception as e:
+        print(f"Could not record LLM usage for {repo}: {e}")
+
+
+def generate_text(prompt, template_version, options=None, model=None, repo=None, parse=None):
+    """
+    Text of a Gemini reply. Served from the response cache when the same (model, template
+    version, prompt, options) was sent before; otherwise sent under the shared concurrency
+    cap, retrying rate limits, server errors and timeouts. Other errors propagate.
+    With repo ("owner/name"), the tokens sent are added to that repo's usage ledger.
+    With parse, returns parse(text) instead and only caches replies it does not map to None,
+    so an unusable reply is asked again next time rather than replayed forever.
+    """
+    model = model or config.GEMINI_MODEL
+    cache = get_llm_cache() if config.LLM_CACHE_ENABLED else None
+    key = LLMResponseCache.make_key(model, template_version, prompt, options)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            value = cached if parse is None else parse(cached)
+            if value is not None:
+                print(f"LLM cache hit for {template_version} prompt")
+                if repo:
+                    _record_usage(repo, template_version, cache_hit=True)
+                return value
+            print(f"Ignoring unusable cached reply for {template_version} prompt")
+
+    response = _call_with_retries(model, prompt, options)
+    text = response.text or ""
+    value = text if parse is None else parse(text)
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None) or count_tokens(prompt)
+    output_tokens = getattr(usage, "candidates_token_count", None) or count_tokens(text)
+    if cache is not None and text and value is not None:
+        cache.put(key, model, template_version, text, prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+    if repo:
+        _record_usage(repo, template_version, prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+    return value
+
+
+async def agenerate_text(prompt, template_version, options=None, model=None, repo=None, parse=None):
+    """Async generate_text; runs on a worker thread so it shares the cache, cap and retries."""
+    return await asyncio.to_thread(generate_text, prompt, template_version, options, model, repo, parse)
@@ -0,0 +1,103 @@
+import sqlite3
+import time
+from threading import Lock, local
+
+from services.scoring import config
+
+
+class UsageLedger:
+    """
+    Running totals of Gemini usage per repo and prompt template: requests sent, prompt and
+    output tokens, and requests answered from the response cache instead.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS llm_usage ("
+            " repo TEXT NOT NULL,"
+            " template TEXT NOT NULL,"
+            " requests INTEGER NOT NULL DEFAULT 0,"
+            " cache_hits INTEGER NOT NULL DEFAULT 0,"
+            " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+            " output_tokens INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL,"
+            " PRIMARY KEY (repo, template))"
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path,
+                timeout=config.SQLITE_BUSY_TIMEOUT_SECONDS,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, repo, template, prompt_tokens=0, output_tokens=0, cache_hit=False):
+        sent = 0 if cache_hit else 1
+        self._connect().execute(
+            "INSERT INTO llm_usage (repo, template, requests, cache_hits, prompt_tokens, output_tokens, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(repo, template) DO UPDATE SET "
+            " requests = requests + excluded.requests,"
+            " cache_hits = cache_hits + excluded.cache_hits,"
+            " prompt_tokens = prompt_tokens + excluded.prompt_tokens,"
+            " output_tokens = output_tokens + excluded.output_tokens,"
+            " updated_at = excluded.updated_at",
+            (repo, template, sent, int(cache_hit), prompt_tokens or 0, output_tokens or 0, time.time()),
+        )
+
+    def for_repo(self, repo):
+        rows = self._connect().execute(
+            "SELECT template, requests, cache_hits, prompt_tokens, output_tokens FROM llm_usage WHERE repo = ?",
+            (repo,),
+        ).fetchall()
+        templates = {
+            template: {
+                "requests": requests,
+                "cache_hits": cache_hits,
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+            }
+            for template, requests, cache_hits, prompt_tokens, output_tokens in rows
+        }
+        return {
+            "repo": repo,
+            "prompt_tokens": sum(t["prompt_tokens"] for t in templates.values()),
+            "output_tokens": sum(t["output_tokens"] for t in templates.values()),
+            "templates": templates,
+        }
+
+    def totals(self):
+        repos, requests, cache_hits, prompt_tokens, output_tokens = self._connect().execute(
+            "SELECT COUNT(DISTINCT repo), COALESCE(SUM(requests), 0), COALESCE(SUM(cache_hits), 0),"
+            " COALESCE(SUM(prompt_tokens), 0), COALESCE(SUM(output_tokens), 0) FROM llm_usage"
+        ).fetchone()
+        return {
+            "repos": repos,
+            "requests": requests,
+            "cache_hits": cache_hits,
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "avg_prompt_tokens_per_repo": round(prompt_tokens / repos, 1) if repos else 0.0,
+        }
+
+
+_ledger = None
+_ledger_lock = Lock()
+
+
+def get_usage_ledger():
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = UsageLedger(config.LLM_USAGE_DB_PATH)
+    return _ledger
@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import dateutil.parser
-from services.scoring.database import get_cached_score, save_score
+import numpy as np
+from services.scoring.database import get_cached_score, update_score
 
 
 def decay_score(value, max_value, min_score=0, max_score=10):
@@ -11,7 +12,11 @@ def decay_score(value, max_value, min_score=0, max_score=10):
     return min_score + (max_score - min_score) * (value / max_value)
 
 
-def _normalize_maintenance_inputs(data):
+# Weights of commit activity, PR merge rate, issue resolution rate and CI presence.
+CATEGORY_1_WEIGHTS = (0.75, 0.15, 0.05, 0.05)
+
+
+def _maintenance_fields(data):
     # Normalize pushed_at field (accept both naming styles)
     pushed_at = data.get("pushed_at") or data.get("pushedAt") or ""
 
@@ -44,12 +49,17 @@ def _normalize_maintenance_inputs(data):
         "ciPresent": data.get("ciPresent", True),
         "testCoveragePercent": data.get("testCoveragePercent", 80),
     }
+    return normalized
+
 
-    print(f"[normalize] pushed_at={normalized['pushed_at']}, last90={commit90}, total={total_commits}")
+def _normalize_maintenance_inputs(data):
+    normalized = _maintenance_fields(data)
+    print(f"[normalize] pushed_at={normalized['pushed_at']}, "
+          f"last90={normalized['commitCountLast90Days']}, total={normalized['totalCommitCount']}")
     return normalized
 
 
-def calculate_commit_activity(pushed_at, commit_count_last_90_days, total_commit_count):
+def calculate_commit_activity(pushed_at, commit_count_last_90_days, total_commit_count, now=None):
     print("Calculating commit activity...")
 
     if not pushed_at:
@@ -65,7 +75,7 @@ def calculate_commit_activity(pushed_at, commit_count_last_90_days, total_commit
         print(f"  Error parsing 'pushed_at': {e}")
         return 0
 
-    now = datetime.now(timezone.utc)
+    now = now or datetime.now(timezone.utc)
     hours_diff = (now - pushed_dt).total_seconds() / 3600
     print(f"  Hours difference between now and pushed_at: {hours_diff}")
 
@@ -118,7 +128,7 @@ def calculate_ci_presence(ci_found=True, coverage_percent=80):
     return 5
 
 
-def calculate_category_1_score(data, owner=None, repo=None):
+def calculate_category_1_score(data, owner=None, repo=None, now=None):
     norm = _normalize_maintenance_inputs(data)
     print(f"calculate_category_1_score inputs: pushed_at={norm.get('pushed_at')}, "
           f"commitCountLast90Days={norm.get('commitCountLast90Days')}, "
@@ -135,7 +145,8 @@ def calculate_category_1_score(data, owner=None, repo=None):
     commit_activity = calculate_commit_activity(
         norm.get("pushed_at"),
         norm.get("commitCountLast90Days"),
-        norm.get("totalCommitCount")
+        norm.get("totalCommitCount"),
+        now=now,
     )
 
     pr_merge_rate = calculate_pr_merge_rate(
@@ -158,20 +169,177 @@ def calculate_category_1_score(data, owner=None, repo=None):
     print(f"Scores → Commit: {commit_activity}, PRs: {pr_merge_rate}, Issues: {issue_resolution_rate}, CI: {ci_presence}")
 
     # Weighted final score
+    w_commit, w_pr, w_issue, w_ci = CATEGORY_1_WEIGHTS
     score = (
-        0.75 * commit_activity +
-        0.15 * pr_merge_rate +
-        0.05 * issue_resolution_rate +
-        0.05 * ci_presence
+        w_commit * commit_activity +
+        w_pr * pr_merge_rate +
+        w_issue * issue_resolution_rate +
+        w_ci * ci_presence
     )
 
     final = round(score, 2)
 
     # Save cache
     if owner and repo:
-        cached = get_cached_score(owner, repo) or {}
-        cached["maintenance_score"] = final
-        save_score(owner, repo, cached)
+        update_score(owner, repo, {"maintenance_score": final})
         print(f"Saved maintenance score for {owner}/{repo}: {final}")
 
-    return final
\ No newline at end of file
+    return final
+
+
+# ---------- Batch scoring ----------
+# Column-wise versions of the functions above for rescoring many repos at once. They repeat
+# the scalar arithmetic operation for operation so results are bit-for-bit identical.
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _epoch_micros(dt):
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
+
+def _pushed_at_micros(pushed_at):
+    """UTC epoch microseconds per timestamp, plus a mask of the ones that parsed."""
+    values = np.asarray(pushed_at, dtype=str)
+    micros = np.zeros(values.shape, dtype=np.int64)
+    valid = np.zeros(values.shape, dtype=bool)
+    if not values.size:
+        return micros, valid
+
+    # GitHub timestamps ("2024-01-01T00:00:00Z") parse in bulk; anything else goes through dateutil.
+    remaining = values != ""
+    zulu = remaining & np.char.endswith(values, "Z")
+    if zulu.any():
+        try:
+            parsed = np.char.rstrip(values[zulu], "Z").astype("datetime64[us]")
+            micros[zulu] = parsed.astype(np.int64)
+            valid[zulu] = True
+            remaining &= ~zulu
+        except ValueError:
+            pass
+
+    for i in np.flatnonzero(remaining):
+        try:
+            micros[i] = _epoch_micros(dateutil.parser.isoparse(values[i]))
+            valid[i] = True
+        except Exception:
+            pass
+    return micros, valid
+
+
+def _decay(values, max_value, min_score=0, max_score=10):
+    scaled = min_score + (max_score - min_score) * (values / max_value)
+    return np.where(values >= max_value, max_score, np.where(values <= 0, min_score, scaled))
+
+
+def _round2(values):
+    """round(x, 2) per element. np.round can differ from round() on exact .xx5 ties, so those go through round()."""
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    ties = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(float(v), 2) for v in values[ties]]
+    return rounded
+
+
+def calculate_commit_activity_batch(pushed_at, commit_count_last_90_days, total_commit_count, now=None):
+    pushed_us, valid = _pushed_at_micros(pushed_at)
+    now_us = _epoch_micros(now or datetime.now(timezone.utc))
+    hours_diff = ((now_us - pushed_us) / 1e6) / 3600
+
+    commits90 = np.asarray(commit_count_last_90_days, dtype=np.int64)
+    total_commits = np.asarray(total_commit_count, dtype=np.int64)
+
+    recency_score = _decay(np.maximum(0, 2160 - hours_diff), 2160)
+    freq_score = _decay(np.minimum(commits90, 100), 100)
+    volume_score = _decay(np.minimum(total_commits, 2000), 2000)
+
+    scores = _round2(0.5 * recency_score + 0.3 * freq_score + 0.2 * volume_score)
+    return np.where(valid, scores, 0.0)
+
+
+def _rate_batch(totals, done, avg_days, penalty_per_day, grace_days):
+    totals = np.asarray(totals, dtype=float)
+    done = np.asarray(done, dtype=float)
+    avg_days = np.asarray(avg_days, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_rate = np.where(totals == 0, 0.0, done / totals)
+    rate_score = _decay(base_rate, 1.0)
+    time_penalty = np.where(avg_days > grace_days, np.maximum(0, 1 - penalty_per_day * (avg_days - grace_days)), 1)
+    scores = _round2(np.maximum(0, np.minimum(rate_score * time_penalty * 10, 10)))
+    return np.where(totals == 0, 0.0, scores)
+
+
+def calculate_pr_merge_rate_batch(total_prs, merged_prs, avg_merge_time_days=5):
+    return _rate_batch(total_prs, merged_prs, avg_merge_time_days, 0.1, 7)
+
+
+def calculate_issue_resolution_rate_batch(total_issues, closed_issues, avg_close_time_days=10):
+    return _rate_batch(total_issues, closed_issues, avg_close_time_days, 0.05, 14)
+
+
+def calculate_ci_presence_batch(ci_found=True, coverage_percent=80):
+    ci_found = np.asarray(ci_found, dtype=bool)
+    coverage = np.asarray(coverage_percent, dtype=float)
+    return np.where(ci_found, np.where(coverage >= 80, 10, np.where(coverage >= 50, 7, 5)), 0)
+
+
+def calculate_category_1_scores_batch(
+    pushed_at,
+    commit_count_last_90_days,
+    total_commit_count,
+    total_prs,
+    merged_prs,
+    total_issues,
+    closed_issues,
+    avg_merge_time_days=5,
+    avg_close_time_days=10,
+    ci_present=True,
+    coverage_percent=80,
+    now=None,
+):
+    """
+    Maintenance scores for many repos from columnar inputs (one entry per repo; scalars broadcast).
+    Matches calculate_category_1_score exactly but skips the cache and logging.
+    Returns the total and each subscore as arrays.
+    """
+    commit_activity = calculate_commit_activity_batch(pushed_at, commit_count_last_90_days, total_commit_count, now)
+    pr_merge_rate = calculate_pr_merge_rate_batch(total_prs, merged_prs, avg_merge_time_days)
+    issue_resolution_rate = calculate_issue_resolution_rate_batch(total_issues, closed_issues, avg_close_time_days)
+    ci_presence = calculate_ci_presence_batch(ci_present, coverage_percent)
+
+    w_commit, w_pr, w_issue, w_ci = CATEGORY_1_WEIGHTS
+    score = (
+        w_commit * commit_activity +
+        w_pr * pr_merge_rate +
+        w_issue * issue_resolution_rate +
+        w_ci * ci_presence
+    )
+    return {
+        "maintenance_score": _round2(score),
+        "commit_activity": commit_activity,
+        "pr_merge_rate": pr_merge_rate,
+        "issue_resolution_rate": issue_resolution_rate,
+        "ci_presence": ci_presence,
+    }
+
+
+def maintenance_columns(rows):
+    """Columnar inputs for calculate_category_1_scores_batch from the dicts calculate_category_1_score takes."""
+    norms = [_maintenance_fields(row) for row in rows]
+    return {
+        "pushed_at": [n["pushed_at"] for n in norms],
+        "commit_count_last_90_days": [n["commitCountLast90Days"] for n in norms],
+        "total_commit_count": [n["totalCommitCount"] for n in norms],
+        "total_prs": [n["pullRequests"].get("totalCount", 0) for n in norms],
+        "merged_prs": [n["pullRequests"].get("merged", 0) for n in norms],
+        "total_issues": [n["issues"].get("totalCount", 0) for n in norms],
+        "closed_issues": [n["issues"].get("closed", 0) for n in norms],
+        "avg_merge_time_days": [n["pullRequests"].get("avgMergeTimeDays", 5) for n in norms],
+        "avg_close_time_days": [n["issues"].get("avgCloseTimeDays", 10) for n in norms],
+        "ci_present": [n["ciPresent"] for n in norms],
+        "coverage_percent": [n["testCoveragePercent"] for n in norms],
+    }
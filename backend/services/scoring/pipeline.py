@@ -0,0 +1,97 @@
+from services.ingest.repo_context import RepoContext
+from services.ingest.ecosyste_client import get_aggregated_code_quality_score
+from services.scoring.maintenance import calculate_category_1_score
+from services.scoring.community import calculate_category_3_score
+from services.scoring.documentation import get_documentation_score
+from services.scoring.singleflight import scoring_flight, flight_key
+from services.scoring.stage_graph import Stage, StageGraph
+
+
+class RepoNotFoundError(LookupError):
+    """GitHub says the repo does not exist or is not visible (as opposed to a failed fetch)."""
+
+
+def _require_score(component, value):
+    # LLM scorers return None instead of a made-up 0 when Gemini fails
+    if value is None:
+        raise RuntimeError(f"{component} produced no score")
+    return value
+
+
+def repo_scoring_stages(ctx: RepoContext):
+    """
+    Fetch and scoring stages for one repo. Each fetch goes through the RepoContext so shared
+    inputs are loaded once; expensive scorers are coalesced with concurrent callers.
+    Every other fetch waits on the snapshot, so nothing else runs for a missing repo.
+    A scorer that cannot produce a score fails its stage rather than returning 0.
+    """
+    owner, name = ctx.owner, ctx.name
+
+    def snapshot():
+        data = ctx.get_snapshot()
+        if not data:
+            raise RepoNotFoundError(f"Repository {owner}/{name} not found or inaccessible.")
+        return data
+
+    return [
+        Stage("snapshot", snapshot),
+        Stage("snippets", lambda snapshot: ctx.get_snippets(), ("snapshot",)),
+        Stage("readme", lambda snapshot: ctx.get_readme(), ("snapshot",)),
+        Stage("contributors", lambda snapshot: ctx.get_contributors(), ("snapshot",)),
+        Stage("pr_summaries", lambda snapshot: ctx.get_pr_summaries(), ("snapshot",)),
+        Stage("issue_summaries", lambda snapshot: ctx.get_issue_summaries(), ("snapshot",)),
+        Stage(
+            "maintenance_score",
+            lambda snapshot: calculate_category_1_score(snapshot),
+            ("snapshot",),
+        ),
+        Stage(
+            "code_quality_score",
+            lambda snippets: _require_score("code_quality_score", scoring_flight.do(
+                flight_key(owner, name, "code_quality"), get_aggregated_code_quality_score, snippets,
+                repo_key=ctx.full_name, default=None,
+            )),
+            ("snippets",),
+        ),
+        Stage(
+            "community_engagement_score",
+            lambda contributors, pr_summaries, issue_summaries: scoring_flight.do(
+                flight_key(owner, name, "community"), calculate_category_3_score, owner, name, context=ctx
+            ),
+            ("contributors", "pr_summaries", "issue_summaries"),
+        ),
+        Stage(
+            "documentation_score",
+            lambda readme: _require_score("documentation_score", scoring_flight.do(
+                flight_key(owner, name, "documentation"), get_documentation_score, owner, name,
+                context=ctx, default=None,
+            )),
+            ("readme",),
+        ),
+    ]
+
+
+SCORE_STAGES = ("maintenance_score", "code_quality_score", "community_engagement_score", "documentation_score")
+
+
+def run_repo_scoring(owner, repo_name):
+    """
+    Score one repo with all independent fetches and scorers running concurrently.
+    Returns (ctx, scores, errors): errors maps each failed stage that callers care about
+    ("snapshot" and the SCORE_STAGES) to its exception, and a failed component scores 0 in
+    scores so callers must not persist it. A RepoNotFoundError under "snapshot" means the
+    repo does not exist; nothing else is fetched then.
+    """
+    ctx = RepoContext(owner, repo_name)
+    results, stage_errors = StageGraph(repo_scoring_stages(ctx)).run()
+    if "snapshot" in stage_errors:
+        print(f"Skipping scoring for {owner}/{repo_name}: {stage_errors['snapshot']}", flush=True)
+        return ctx, {component: 0 for component in SCORE_STAGES}, {"snapshot": stage_errors["snapshot"]}
+
+    scores, errors = {}, {}
+    for component in SCORE_STAGES:
+        if component in stage_errors:
+            print(f"Error calculating {component} for {owner}/{repo_name}: {stage_errors[component]}", flush=True)
+            errors[component] = stage_errors[component]
+        scores[component] = results.get(component, 0)
+    return ctx, scores, errors
@@ -0,0 +1,73 @@
+import re
+
+_CHARS_PER_TOKEN = 4
+# Lines shorter than this (braces, "end", "else:") are never deduplicated.
+_MIN_DEDUPE_LENGTH = 8
+
+_BOILERPLATE = re.compile(
+    r"(spdx-license-identifier|copyright\s*(\(c\)|©|\d{4})|all rights reserved|licensed under the"
+    r"|permission is hereby granted|the software is provided \"as is\"|without warranties or conditions"
+    r"|img\.shields\.io|badge\.svg|badgen\.net|^\s*\[!\[|^\s*!\[[^\]]*\]\([^)]*\)\s*$|^\s*<img\b|^\s*<!--"
+    r"|^\s*[-*]\s*\[[^\]]+\]\(#[^)]*\)\s*$)",
+    re.IGNORECASE,
+)
+
+
+def count_tokens(text):
+    """Token estimate for Gemini prompts (about four characters per token)."""
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+
+
+def is_boilerplate(line):
+    """License headers, badges, images, HTML comments and table-of-contents links."""
+    return bool(_BOILERPLATE.search(line))
+
+
+class PromptBuilder:
+    """
+    Assembles a prompt from a fixed header and named sections, each trimmed to its own token
+    budget at a line boundary. Blank and boilerplate lines are dropped. Sections added with
+    dedupe=True also skip lines already included in an earlier deduplicating section; lines are
+    never dropped for repeating within the section itself, so code keeps its structure.
+    """
+
+    def __init__(self, header):
+        self.header = header
+        self.sections = []
+        self.dropped_lines = 0
+        self._seen = set()
+
+    def add_section(self, title, text, budget, dedupe=False):
+        """Add up to `budget` tokens of text's lines under title; returns the tokens used."""
+        used = count_tokens(title) + 1 if title else 0
+        kept = []
+        keys = set()
+        repeated = 0
+        for line in (text or "").splitlines():
+            line = line.rstrip()
+            if not line.strip() or is_boilerplate(line):
+                self.dropped_lines += 1
+                continue
+            key = " ".join(line.split()).lower()
+            if dedupe and len(key) >= _MIN_DEDUPE_LENGTH and key in self._seen:
+                self.dropped_lines += 1
+                repeated += 1
+                continue
+            cost = count_tokens(line) + 1
+            if used + cost > budget:
+                break
+            kept.append(line)
+            used += cost
+            keys.add(key)
+        if dedupe:
+            self._seen |= keys
+        if not kept and repeated:
+            kept.append("(same lines as above)")
+        self.sections.append((title, "\n".join(kept)))
+        return used
+
+    def build(self):
+        parts = [self.header]
+        for title, body in self.sections:
+            parts.append(f"\n{title}\n{body}\n" if title else f"{body}\n")
+        return "".join(parts)
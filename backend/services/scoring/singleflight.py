@@ -0,0 +1,45 @@
+from concurrent.futures import Future
+from threading import Lock
+
+
+class SingleFlight:
+    """
+    In-flight deduplication: concurrent calls with the same key share one computation.
+    The first caller runs fn; callers arriving while it runs block on its result
+    (or its exception) instead of starting their own copy.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+
+# Shared by /score, process_repo and batch scoring; keys are "owner/repo:component".
+scoring_flight = SingleFlight()
+
+
+def flight_key(owner, repo_name, component):
+    return f"{owner}/{repo_name}:{component}"
@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from services.scoring import config
+
+
+@dataclass
+class Stage:
+    """One node of a stage graph; fn is called with the results of `inputs` as keyword arguments."""
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+
+
+class StageGraph:
+    """
+    Minimal DAG executor: every stage starts as soon as all of its inputs are available,
+    so stages that share no inputs run concurrently. A stage whose input failed is not run
+    and inherits that input's error.
+    """
+
+    def __init__(self, stages):
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            unknown = [dep for dep in stage.inputs if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {unknown}")
+
+    def run(self, max_workers=None):
+        """Run every stage; returns (results, errors) keyed by stage name."""
+        results: Dict[str, Any] = {}
+        errors: Dict[str, BaseException] = {}
+        pending = dict(self.stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or config.SCORE_STAGE_WORKERS) as executor:
+            def launch_ready():
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name, stage in list(pending.items()):
+                        if not all(dep in results or dep in errors for dep in stage.inputs):
+                            continue
+                        del pending[name]
+                        progressed = True
+                        failed = [dep for dep in stage.inputs if dep in errors]
+                        if failed:
+                            errors[name] = errors[failed[0]]
+                            continue
+                        kwargs = {dep: results[dep] for dep in stage.inputs}
+                        running[executor.submit(stage.fn, **kwargs)] = name
+
+            launch_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        errors[name] = e
+                launch_ready()
+            if pending:
+                raise ValueError(f"Stage graph has a cycle through {sorted(pending)}")
+
+        return results, errors
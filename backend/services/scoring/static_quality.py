@@ -0,0 +1,153 @@
+import ast
+import re
+from collections import Counter
+
+from services.scoring import config
+
+_COMMENT_PREFIXES = ("#", "//", "/*", "*", '"""', "'''")
+_BRACE_LANGUAGES = (".js", ".ts", ".java", ".kt", ".cpp", ".c", ".go")
+_FUNCTION_START = re.compile(
+    r"^\s*(?:def |async def |function\b|func |fun |"
+    r"(?:(?:public|private|protected|static|final|async|export|inline|virtual|override)\s+)*"
+    r"[\w<>\[\]*&:]+\s+\w+\s*\([^;]*\)\s*(?:const\s*)?\{?\s*$)"
+)
+_PY_BLOCKS = (
+    ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try,
+    ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef,
+)
+
+
+def _is_comment(stripped):
+    return stripped.startswith(_COMMENT_PREFIXES)
+
+
+def _python_structure(content):
+    """(max nesting depth, function lengths) from the AST, or None if the snippet does not parse."""
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+
+    def depth(node, level):
+        deepest = level
+        for child in ast.iter_child_nodes(node):
+            deepest = max(deepest, depth(child, level + isinstance(child, _PY_BLOCKS)))
+        return deepest
+
+    lengths = [
+        node.end_lineno - node.lineno + 1
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    return depth(tree, 0), lengths
+
+
+def _brace_structure(code_lines):
+    deepest, level = 0, 0
+    lengths, open_functions = [], []
+    for i, line in enumerate(code_lines):
+        if _FUNCTION_START.match(line):
+            open_functions.append((level, i))
+        level += line.count("{") - line.count("}")
+        level = max(level, 0)
+        deepest = max(deepest, level)
+        while open_functions and level <= open_functions[-1][0] and "}" in line:
+            _, start = open_functions.pop()
+            lengths.append(i - start + 1)
+    return deepest, lengths
+
+
+def _indent_structure(code_lines):
+    indents = [len(line) - len(line.lstrip()) for line in code_lines]
+    unit = min((n for n in indents if n), default=4)
+    deepest = max((n // unit for n in indents), default=0)
+    lengths, open_functions = [], []
+    for i, (line, indent) in enumerate(zip(code_lines, indents)):
+        while open_functions and indent <= open_functions[-1][0]:
+            _, start = open_functions.pop()
+            lengths.append(i - start)
+        if _FUNCTION_START.match(line):
+            open_functions.append((indent, i))
+    lengths.extend(len(code_lines) - start for _, start in open_functions)
+    return deepest, lengths
+
+
+def analyze_snippet(snippet):
+    """
+    Lexical and structural metrics for one snippet from fetch_code_snippets. Uses the full
+    file ("source"); "content" is only a comment-first excerpt and rarely parses.
+    """
+    content = snippet.get("source") or snippet.get("content") or ""
+    path = snippet.get("file_path") or ""
+    lines = [line.rstrip() for line in content.splitlines() if line.strip()]
+    comment_lines = [line for line in lines if _is_comment(line.strip())]
+    code_lines = [line for line in lines if not _is_comment(line.strip())]
+
+    structure = _python_structure(content) if path.endswith(".py") else None
+    parsed = structure is not None
+    if structure is None:
+        structure = _brace_structure(code_lines) if path.endswith(_BRACE_LANGUAGES) else _indent_structure(code_lines)
+    max_nesting, function_lengths = structure
+
+    return {
+        "lines": len(lines),
+        "code_lines": len(code_lines),
+        "comment_ratio": len(comment_lines) / len(lines) if lines else 0.0,
+        "long_line_ratio": sum(len(line) > 100 for line in code_lines) / len(code_lines) if code_lines else 0.0,
+        "max_nesting": max_nesting,
+        "max_function_length": max(function_lengths, default=0),
+        "avg_function_length": sum(function_lengths) / len(function_lengths) if function_lengths else 0.0,
+        "parsed": parsed,
+        "normalized_code": [" ".join(line.split()) for line in code_lines],
+    }
+
+
+def _duplication_ratio(normalized_lines):
+    """Share of substantial code lines that repeat another line, across all snippets."""
+    substantial = [line for line in normalized_lines if len(line) >= 12]
+    if not substantial:
+        return 0.0
+    counts = Counter(substantial)
+    return sum(n - 1 for n in counts.values()) / len(substantial)
+
+
+def estimate_code_quality(snippets):
+    """
+    Network-free 0-10 code-quality estimate from snippet metrics, with a 0-1 confidence that
+    grows with the amount of code seen. Returns score None (confidence 0) without snippets.
+    """
+    analyses = [analyze_snippet(s) for s in snippets or []]
+    code_lines = sum(a["code_lines"] for a in analyses)
+    if not code_lines:
+        return {"score": None, "confidence": 0.0, "metrics": {}}
+
+    total_lines = sum(a["lines"] for a in analyses)
+    metrics = {
+        "code_lines": code_lines,
+        "comment_ratio": round(sum(a["comment_ratio"] * a["lines"] for a in analyses) / total_lines, 3),
+        "long_line_ratio": round(sum(a["long_line_ratio"] * a["code_lines"] for a in analyses) / code_lines, 3),
+        "max_nesting": max(a["max_nesting"] for a in analyses),
+        "max_function_length": max(a["max_function_length"] for a in analyses),
+        "avg_function_length": round(max(a["avg_function_length"] for a in analyses), 1),
+        "duplication_ratio": round(_duplication_ratio([line for a in analyses for line in a["normalized_code"]]), 3),
+    }
+
+    score = 10.0
+    if metrics["comment_ratio"] < 0.05:
+        score -= 2 * (0.05 - metrics["comment_ratio"]) / 0.05
+    elif metrics["comment_ratio"] > 0.6:
+        score -= min(1.0, (metrics["comment_ratio"] - 0.6) * 2.5)
+    score -= min(3.0, 0.75 * max(0, metrics["max_nesting"] - 4))
+    score -= min(2.0, max(0.0, metrics["avg_function_length"] - 30) / 10)
+    score -= min(1.5, 5 * metrics["long_line_ratio"])
+    score -= min(2.0, 6 * metrics["duplication_ratio"])
+
+    coverage = min(1.0, code_lines / config.STATIC_QUALITY_FULL_CONFIDENCE_LINES)
+    structured = sum(a["code_lines"] for a in analyses if a["parsed"] or a["max_function_length"]) / code_lines
+    confidence = coverage * (0.7 + 0.3 * structured)
+
+    return {
+        "score": round(max(0.0, min(score, 10.0)), 2),
+        "confidence": round(confidence, 2),
+        "metrics": metrics,
+    }
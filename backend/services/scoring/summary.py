@@ -0,0 +1,33 @@
+HIGHLIGHT_THRESHOLD = 8.0
+WEAKNESS_THRESHOLD = 5.0
+
+
+def summarize_scores(maintenance_score, code_quality_score, community_score, documentation_score):
+    """
+    Combine the four category scores into the overall score and
+    the highlight / "Weak in ..." labels shown on repo cards.
+    Returns (combined_score, top_highlights, special_mentions).
+    """
+    combined_score = round(
+        0.4 * maintenance_score +
+        0.25 * code_quality_score +
+        0.25 * community_score +
+        0.10 * documentation_score,
+        2
+    )
+
+    highlights = []
+    special_mentions = []
+    scores_dict = {
+        "Maintenance": maintenance_score,
+        "Code Quality": code_quality_score,
+        "Community": community_score,
+        "Documentation": documentation_score,
+    }
+    for cat, score in scores_dict.items():
+        if score >= HIGHLIGHT_THRESHOLD:
+            highlights.append(cat)
+        elif score < WEAKNESS_THRESHOLD:
+            special_mentions.append(f"Weak in {cat}")
+
+    return combined_score, highlights, special_mentions
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Modules that talk to GitHub refuse to import without a token, and the stores default to files
+# inside the package; point both somewhere harmless before any test imports them.
+_tmp = tempfile.mkdtemp(prefix="oss-engine-tests-")
+os.environ.setdefault("GITHUB_TOKEN", "test-token")
+os.environ.setdefault("SCORE_DB_PATH", os.path.join(_tmp, "score_cache.db"))
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_tmp, "llm_cache.db"))
@@ -0,0 +1,75 @@
+import asyncio
+import base64
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.ingest import async_fetcher, repo_fetcher
+from services.ingest.async_fetcher import AsyncGitHubClient
+from services.ingest.http_cache import ConditionalCache
+
+
+def _serve(monkeypatch, tmp_path, routes, test):
+    cache = ConditionalCache(str(tmp_path / "http.db"), max_entries=10)
+    monkeypatch.setattr(async_fetcher, "get_http_cache", lambda: cache)
+
+    async def main():
+        app = web.Application()
+        app.add_routes(routes)
+        async with TestServer(app) as server:
+            base = str(server.make_url("")).rstrip("/")
+            monkeypatch.setattr(async_fetcher, "GITHUB_API_URL", base)
+            monkeypatch.setattr(async_fetcher, "GITHUB_GRAPHQL_URL", f"{base}/graphql")
+            async with AsyncGitHubClient() as gh:
+                await test(gh, base)
+
+    asyncio.run(main())
+    return cache
+
+
+def test_repeat_requests_are_revalidated_through_the_shared_etag_cache(monkeypatch, tmp_path):
+    sent = []
+
+    async def readme(request):
+        sent.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        content = base64.b64encode(b"# Hello\nInstall with pip").decode()
+        return web.json_response({"content": content, "encoding": "base64"}, headers={"ETag": '"v1"'})
+
+    async def test(gh, base):
+        assert await gh.fetch_readme("o", "r") == "# Hello\nInstall with pip"
+        assert await gh.fetch_readme("o", "r", keywords=["install"]) == "Install with pip"
+
+    cache = _serve(monkeypatch, tmp_path, [web.get("/repos/o/r/readme", readme)], test)
+
+    assert sent == [None, '"v1"']
+    assert cache.stats()["revalidated_304"] == 1
+
+
+def test_contributors_count_from_link_header_and_batch_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(repo_fetcher, "_profile_cache", repo_fetcher.LRUCache(10))
+    calls = []
+
+    async def contributors(request):
+        calls.append(request.query["per_page"])
+        if request.query["per_page"] == "1":
+            last = f"{request.url.with_query(per_page=1, page=42)}"
+            return web.json_response([{"login": "a"}], headers={"Link": f'<{last}>; rel="last"'})
+        return web.json_response([{"login": "a", "contributions": 9}, {"login": "b", "contributions": 3}])
+
+    async def graphql(request):
+        calls.append("graphql")
+        return web.json_response({"data": {"u0": {"location": "Oslo", "createdAt": "2020-01-01T00:00:00Z"}, "u1": None}})
+
+    async def test(gh, base):
+        result = await gh.fetch_contributors_with_locations("o", "r", top_n=2)
+        assert result["total_contributors"] == 42
+        assert result["top_contributors"] == [
+            {"login": "a", "contributions": 9, "location": "Oslo", "created_at": "2020-01-01T00:00:00Z"},
+            {"login": "b", "contributions": 3, "location": None, "created_at": None},
+        ]
+
+    _serve(monkeypatch, tmp_path, [web.get("/repos/o/r/contributors", contributors), web.post("/graphql", graphql)], test)
+
+    assert calls == ["1", "2", "graphql"]
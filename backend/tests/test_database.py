@@ -0,0 +1,67 @@
+import json
+import time
+
+from services.lru_cache import LRUCache
+from services.scoring.database import (
+    JsonFileBackend,
+    SQLiteBackend,
+    get_cached_score,
+    save_score,
+    set_backend,
+    update_score,
+)
+
+
+def test_sqlite_backend_roundtrip(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "scores.db"))
+    assert backend.get("octocat/Hello-World") is None
+    backend.put("octocat/Hello-World", {"combined_score": 7.5})
+    backend.put("octocat/Hello-World", {"combined_score": 8.0})
+    assert backend.get("octocat/Hello-World") == {"combined_score": 8.0}
+
+
+def test_sqlite_backend_migrates_json_once(tmp_path):
+    legacy = tmp_path / "score_cache.json"
+    legacy.write_text(json.dumps({"facebook/react": {"combined_score": 6.75}}))
+    db_path = str(tmp_path / "scores.db")
+
+    backend = SQLiteBackend(db_path, legacy_json_path=str(legacy))
+    assert backend.get("facebook/react") == {"combined_score": 6.75}
+
+    backend.put("facebook/react", {"combined_score": 7.0})
+    legacy.write_text(json.dumps({"facebook/react": {"combined_score": 1.0}}))
+    reopened = SQLiteBackend(db_path, legacy_json_path=str(legacy))
+    assert reopened.get("facebook/react") == {"combined_score": 7.0}
+
+
+def test_json_backend_roundtrip(tmp_path):
+    backend = JsonFileBackend(str(tmp_path / "scores.json"))
+    backend.put("octocat/Hello-World", {"combined_score": 7.5})
+    assert backend.get("octocat/Hello-World") == {"combined_score": 7.5}
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_update_score_stamps_only_changed_components(tmp_path):
+    set_backend(SQLiteBackend(str(tmp_path / "scores.db")))
+    try:
+        save_score("octocat", "Hello-World", {"maintenance_score": 6.0, "documentation_score": 5.0})
+        first = get_cached_score("octocat", "Hello-World")["component_updated_at"]
+        time.sleep(0.01)
+        entry = update_score("octocat", "Hello-World", {"documentation_score": 7.0})
+    finally:
+        set_backend(None)
+
+    assert entry["documentation_score"] == 7.0
+    assert entry["component_updated_at"]["maintenance_score"] == first["maintenance_score"]
+    assert entry["component_updated_at"]["documentation_score"] > first["documentation_score"]
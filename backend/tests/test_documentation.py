@@ -0,0 +1,15 @@
+from services.scoring import config, documentation
+
+
+class _Ctx:
+    def get_readme(self):
+        return "# Project\nInstall with pip\nSee the example below"
+
+
+def test_gemini_failure_returns_the_default_instead_of_zero(monkeypatch):
+    monkeypatch.setattr(config, "DOCUMENTATION_SINGLE_PROMPT", True)
+    monkeypatch.setattr(documentation, "send_structured_prompt_to_gemini", lambda *a, **k: None)
+    monkeypatch.setattr(documentation, "send_prompt_to_gemini", lambda prompt, repo=None: None)
+
+    assert documentation.get_documentation_score("o", "r", use_cache=False, context=_Ctx(), default=None) is None
+    assert documentation.get_documentation_score("o", "r", use_cache=False, context=_Ctx()) == 0
@@ -0,0 +1,123 @@
+from services.scoring import config, enhanced_scoring
+from services.scoring.enhanced_scoring import _code_quality_contenders, _needs_llm_code_quality, _score_details
+
+
+def _repo(name, maintenance=5, community=5, code_quality=7.0, confidence=0.9):
+    return {
+        "repo": name,
+        "maintenance_score": maintenance,
+        "community_score": community,
+        "code_quality_score": code_quality,
+        "code_quality_confidence": confidence,
+    }
+
+
+class _Ctx:
+    owner, name = "o", "r"
+
+    def get_readme(self):
+        return "# r"
+
+    def get_snippets(self):
+        return [{"file_path": "a.py", "content": "x = 1"}]
+
+
+def test_llm_is_needed_for_contenders_and_uncertain_estimates(monkeypatch):
+    monkeypatch.setattr(config, "STATIC_QUALITY_MIN_CONFIDENCE", 0.6)
+    assert not _needs_llm_code_quality(_repo("o/sure"), contender=False)
+    assert _needs_llm_code_quality(_repo("o/sure"), contender=True)
+    assert _needs_llm_code_quality(_repo("o/unsure", confidence=0.3), contender=False)
+    assert _needs_llm_code_quality(_repo("o/none", code_quality=None, confidence=0.0), contender=False)
+
+
+def test_contenders_are_the_top_ranks_by_provisional_score(monkeypatch):
+    monkeypatch.setattr(config, "CODE_QUALITY_LLM_TOP_RANKS", 2)
+    tier = [_repo("o/low", 1, 1), _repo("o/high", 9, 9), _repo("o/mid", 6, 6), _repo("o/top", 10, 10)]
+    assert _code_quality_contenders(tier) == {"o/high", "o/top"}
+
+
+def test_failed_llm_code_quality_falls_back_to_static_estimate(monkeypatch):
+    monkeypatch.setattr(enhanced_scoring, "get_documentation_score", lambda *a, **k: 6)
+    monkeypatch.setattr(enhanced_scoring, "get_aggregated_code_quality_score", lambda *a, **k: k["default"])
+
+    doc, code_quality, source = _score_details(1, _repo("o/r", code_quality=7.5), _Ctx(), contender=True)
+    assert (doc, code_quality, source) == (6, 7.5, "static")
+
+    monkeypatch.setattr(enhanced_scoring, "get_aggregated_code_quality_score", lambda *a, **k: 9.0)
+    assert _score_details(1, _repo("o/r", code_quality=7.5), _Ctx(), contender=True) == (6, 9.0, "llm")
+
+
+def test_github_inputs_are_fetched_before_taking_an_llm_slot(monkeypatch):
+    calls = []
+
+    class _Slot:
+        def __enter__(self):
+            calls.append("llm slot")
+
+        def __exit__(self, *exc):
+            calls.append("llm release")
+
+    class _RecordingCtx(_Ctx):
+        def get_readme(self):
+            calls.append("readme")
+            return super().get_readme()
+
+        def get_snippets(self):
+            calls.append("snippets")
+            return super().get_snippets()
+
+    monkeypatch.setattr(enhanced_scoring, "_llm_slots", _Slot())
+    monkeypatch.setattr(enhanced_scoring, "get_documentation_score", lambda *a, **k: calls.append("doc") or 6)
+    monkeypatch.setattr(enhanced_scoring, "get_aggregated_code_quality_score", lambda *a, **k: 9.0)
+
+    _score_details(1, _repo("o/r"), _RecordingCtx(), contender=True)
+
+    assert calls[:3] == ["readme", "snippets", "llm slot"]
+    assert calls[-1] == "llm release"
+
+
+class _SearchCtx(_Ctx):
+    full_name = "o/r"
+    good_first_issues_count, pushed_at, topics = 0, "", []
+
+    def __init__(self):
+        self.snippet_fetches = 0
+
+    def set_snapshot(self, snapshot):
+        pass
+
+    def get_snapshot(self):
+        return {"name": "r"}
+
+    def get_snippets(self):
+        self.snippet_fetches += 1
+        return super().get_snippets()
+
+
+def test_static_estimate_only_fetches_snippets_within_the_cap(monkeypatch):
+    ctx = _SearchCtx()
+    monkeypatch.setattr(config, "STATIC_QUALITY_MAX_REPOS", 1)
+    monkeypatch.setattr(enhanced_scoring.RepoContext, "from_search_item", staticmethod(lambda repo: ctx))
+    monkeypatch.setattr(enhanced_scoring, "calculate_category_1_score", lambda *a, **k: 5)
+    monkeypatch.setattr(enhanced_scoring, "calculate_category_3_score", lambda *a, **k: 5)
+
+    _, first = enhanced_scoring._score_basics(1, 2, {"full_name": "o/r"}, None)
+    _, second = enhanced_scoring._score_basics(2, 2, {"full_name": "o/r"}, None)
+
+    assert ctx.snippet_fetches == 1
+    assert first["code_quality_source"] == "static"
+    assert second["code_quality_score"] is None and second["code_quality_source"] is None
+
+
+def test_batch_maintenance_scores_match_scalar_for_batched_snapshots():
+    top = [{"owner": "o", "name": "busy", "pushed_at": "2024-01-01T00:00:00Z"}, {"owner": "o", "name": "missing"}]
+    snapshot = {
+        "pushedAt": "2024-01-02T00:00:00Z", "commitCountLast90Days": 40, "totalCommitCount": 900,
+        "pullRequests": {"totalCount": 30, "merged": 21}, "issues": {"totalCount": 50, "closed": 35},
+    }
+
+    scores = enhanced_scoring._batch_maintenance_scores(top, {"o/busy": snapshot, "o/missing": None})
+
+    ctx = enhanced_scoring.RepoContext.from_search_item(top[0])
+    ctx.set_snapshot(snapshot)
+    assert scores == {"o/busy": enhanced_scoring.calculate_category_1_score(ctx.maintenance_inputs())}
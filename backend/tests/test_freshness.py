@@ -0,0 +1,33 @@
+from services.scoring import freshness
+
+
+class _Ctx:
+    full_name = "o/r"
+
+    def __init__(self, owner, name):
+        self.owner, self.name = owner, name
+
+    def get_snapshot(self):
+        return {"pushedAt": "2026-10-01T00:00:00Z", "readmeSha": "new", "snippetShas": ["s2"]}
+
+
+def test_failed_llm_refresh_keeps_the_cached_score_stale(monkeypatch):
+    entry = {
+        "documentation_score": 7.5,
+        "code_quality_score": 8.0,
+        "component_updated_at": {"documentation_score": 1, "code_quality_score": 1},
+        "component_inputs": {"documentation_score": {"readmeSha": "old"}, "code_quality_score": {"snippetShas": ["s1"]}},
+    }
+    monkeypatch.setattr(freshness, "RepoContext", _Ctx)
+    monkeypatch.setitem(freshness.COMPONENT_SCORERS, "documentation_score", lambda ctx: None)
+    monkeypatch.setitem(freshness.COMPONENT_SCORERS, "code_quality_score", lambda ctx: 6.0)
+    monkeypatch.setattr(freshness, "modify_score", lambda owner, repo, fn: fn(entry))
+
+    values = freshness.refresh_components("o", "r", ["documentation_score", "code_quality_score"], dict(entry))
+
+    assert values == {"code_quality_score": 6.0}
+    assert entry["documentation_score"] == 7.5
+    assert entry["component_updated_at"]["documentation_score"] == 1
+    assert entry["component_inputs"]["documentation_score"] == {"readmeSha": "old"}
+    assert entry["code_quality_score"] == 6.0
+    assert freshness.stale_components(entry) == ["documentation_score"]
@@ -0,0 +1,34 @@
+import requests
+
+from services.ingest.http_cache import ConditionalCache
+
+
+def _response(status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    response.url = "https://api.github.com/repos/octocat/Hello-World/readme"
+    return response
+
+
+def test_replays_stored_body_on_304(tmp_path):
+    cache = ConditionalCache(str(tmp_path / "http.db"), max_entries=10)
+    key = cache.make_key("https://api.github.com/repos/octocat/Hello-World/readme", {"per_page": 1})
+
+    cache.store(key, _response(200, b'{"content": ""}', {"ETag": '"abc"', "X-RateLimit-Remaining": "10"}))
+    entry = cache.lookup(key)
+    assert cache.validators(entry) == {"If-None-Match": '"abc"'}
+
+    replayed = cache.replay(key, entry, _response(304, headers={"X-RateLimit-Remaining": "9"}))
+    assert replayed.status_code == 200
+    assert replayed.json() == {"content": ""}
+    assert replayed.headers["X-RateLimit-Remaining"] == "9"
+    assert cache.stats()["revalidated_304"] == 1
+
+
+def test_skips_responses_without_validators(tmp_path):
+    cache = ConditionalCache(str(tmp_path / "http.db"), max_entries=10)
+    key = cache.make_key("https://api.github.com/search/repositories")
+    cache.store(key, _response(200, b"{}"))
+    assert cache.lookup(key) is None
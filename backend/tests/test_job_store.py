@@ -0,0 +1,77 @@
+import threading
+import time
+
+from services.scoring import jobs
+from services.scoring.job_store import JobStore
+
+
+def test_job_progress_partial_results_and_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    job_id = store.create({"language": "python"})
+    store.set_status(job_id, "running", total=3)
+    store.put_result(job_id, "a/one", {"repo": "a/one", "combined_score": 4.0})
+    store.put_result(job_id, "a/two", {"repo": "a/two", "combined_score": 6.0})
+    store.patch_result(job_id, "a/one", {"documentation_score": 9, "combined_score": 7.5})
+
+    job = store.get(job_id)
+    assert job["progress"] == {"total": 3, "done": 2, "in_flight": 1, "failed": 0, "detailed": 1}
+    assert [r["repo"] for r in store.results(job_id)] == ["a/one", "a/two"]
+    assert store.results(job_id)[0]["documentation_score"] == 9
+
+    reopened = JobStore(path)
+    assert reopened.interrupt_stale(max_age=60, now=time.time() + 120) == 1
+    assert reopened.get(job_id)["status"] == "interrupted"
+    assert len(reopened.results(job_id)) == 2
+
+    other = reopened.create({})
+    reopened.finish(other, [{"repo": "b/low", "combined_score": 1}, {"repo": "b/high", "combined_score": 2}])
+    assert reopened.get(other)["status"] == "done"
+    assert [r["repo"] for r in reopened.results(other)] == ["b/low", "b/high"]
+    assert reopened.get("missing") is None
+
+
+def test_only_jobs_with_stale_heartbeats_are_interrupted(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    now = time.time()
+    dead = store.create({}, owner="host:1:dead")
+    alive = store.create({}, owner="host:2:alive")
+    store.set_status(dead, "running")
+    store.set_status(alive, "running")
+
+    # Another live worker starting up later must not interrupt jobs that keep heartbeating
+    assert store.heartbeat("host:2:alive", now=now + 300) == 1
+    assert store.interrupt_stale(max_age=180, now=now + 300) == 1
+
+    assert store.get(dead)["status"] == "interrupted"
+    assert store.get(alive)["status"] == "running"
+
+
+def test_job_taken_away_from_this_process_is_cancelled(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    monkeypatch.setattr(jobs, "_store", store)
+    started = threading.Event()
+    saw_cancel = []
+
+    def fake_batch(repos, on_event=None, cancelled=None):
+        on_event("repo", {"repo": "o/first", "combined_score": 1})
+        started.set()
+        saw_cancel.append(cancelled.wait(5))
+        on_event("repo", {"repo": "o/late", "combined_score": 2})
+        return []
+
+    monkeypatch.setattr(jobs, "batch_score_repositories", fake_batch)
+    job_id = store.create({}, owner=jobs.JOB_OWNER)
+    runner = threading.Thread(target=jobs._run_job, args=(job_id, lambda: [{"owner": "o", "name": "first"}]))
+    runner.start()
+    assert started.wait(5)
+
+    # Another worker decided this process is dead
+    assert store.interrupt_stale(max_age=0, now=time.time() + 1) == 1
+    jobs._cancel_orphaned_jobs(store)
+    runner.join(5)
+
+    assert saw_cancel == [True]
+    assert store.get(job_id)["status"] == "interrupted"
+    assert [r["repo"] for r in store.results(job_id)] == ["o/first"]
+    assert job_id not in jobs._cancel_events
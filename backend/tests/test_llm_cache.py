@@ -0,0 +1,71 @@
+import itertools
+from types import SimpleNamespace
+
+from services.scoring import config, llm_cache, llm_gateway
+from services.scoring.llm_cache import LLMResponseCache
+from services.scoring.llm_gateway import generate_text
+
+
+class FakeModels:
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, model, contents, **kwargs):
+        self.calls += 1
+        usage = SimpleNamespace(prompt_token_count=120, candidates_token_count=3)
+        return SimpleNamespace(text=f"score for {contents}", usage_metadata=usage)
+
+
+def test_identical_prompts_are_sent_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(str(tmp_path / "llm.db"), max_entries=10))
+    client = SimpleNamespace(models=FakeModels())
+    monkeypatch.setattr(llm_gateway, "_client", client)
+
+    first = generate_text("prompt", "v1", model="m")
+    assert generate_text("prompt", "v1", model="m") == first
+    generate_text("prompt", "v2", model="m")
+    generate_text("prompt", "v1", model="other-model")
+
+    assert client.models.calls == 3
+    stats = llm_cache.llm_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 3
+    assert stats["prompt_tokens_saved"] == 120 and stats["output_tokens_saved"] == 3
+
+
+def test_least_recently_used_entries_are_pruned(tmp_path, monkeypatch):
+    # Every put/get stamps accessed_at from a strictly increasing fake clock
+    clock = itertools.count(1000)
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=2)
+    keys = [cache.make_key("m", "v1", f"p{i}") for i in range(3)]
+    for key in keys:
+        cache.put(key, "m", "v1", "7")
+    cache.get(keys[0])
+    cache._prune()
+
+    assert cache.get(keys[0]) == "7"
+    assert cache.get(keys[1]) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_replies_the_caller_cannot_parse_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_cache, "_cache", LLMResponseCache(str(tmp_path / "llm.db"), max_entries=10))
+    replies = iter(["not json", '{"clarity": 7}'])
+    models = SimpleNamespace(calls=0)
+
+    def generate_content(model, contents, **kwargs):
+        models.calls += 1
+        return SimpleNamespace(text=next(replies), usage_metadata=None)
+
+    models.generate_content = generate_content
+    monkeypatch.setattr(llm_gateway, "_client", SimpleNamespace(models=models))
+
+    def parse(text):
+        return text if text.startswith("{") else None
+
+    assert generate_text("prompt", "v1", model="m", parse=parse) is None
+    assert generate_text("prompt", "v1", model="m", parse=parse) == '{"clarity": 7}'
+    assert generate_text("prompt", "v1", model="m", parse=parse) == '{"clarity": 7}'
+    assert models.calls == 2
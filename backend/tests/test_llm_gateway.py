@@ -0,0 +1,88 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+from google.genai import errors
+
+from services.scoring import config, llm_gateway
+from services.scoring.llm_cache import LLMResponseCache
+from services.scoring.llm_usage import UsageLedger
+
+
+class FlakyModels:
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    def generate_content(self, model, contents, **kwargs):
+        self.calls += 1
+        if self.failures:
+            raise errors.APIError(self.failures.pop(0), {"error": {"message": "try later"}})
+        return SimpleNamespace(text="9", usage_metadata=None)
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(llm_gateway.time, "sleep", lambda seconds: None)
+
+    def install(failures):
+        models = FlakyModels(failures)
+        monkeypatch.setattr(llm_gateway, "_client", SimpleNamespace(models=models))
+        return models
+
+    return install
+
+
+def test_retries_rate_limits_and_server_errors(gateway):
+    models = gateway([429, 503])
+    assert llm_gateway.generate_text("prompt", "v1") == "9"
+    assert models.calls == 3
+
+
+def test_client_errors_are_not_retried(gateway):
+    models = gateway([400])
+    with pytest.raises(errors.APIError):
+        llm_gateway.generate_text("prompt", "v1")
+    assert models.calls == 1
+
+
+def test_missing_api_key_fails_on_first_use_not_import(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    monkeypatch.setattr(llm_gateway, "_client", None)
+    with pytest.raises(RuntimeError):
+        llm_gateway.get_client()
+
+
+def test_usage_is_recorded_for_sent_requests_and_cache_hits(gateway, monkeypatch, tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=10)
+    ledger = UsageLedger(str(tmp_path / "usage.db"))
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_gateway, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_gateway, "get_usage_ledger", lambda: ledger)
+    models = gateway([])
+
+    assert llm_gateway.generate_text("prompt", "v1", repo="o/r") == "9"
+    assert llm_gateway.generate_text("prompt", "v1", repo="o/r") == "9"
+
+    usage = ledger.for_repo("o/r")["templates"]["v1"]
+    assert models.calls == 1
+    assert usage["requests"] == 1 and usage["cache_hits"] == 1
+    assert usage["prompt_tokens"] > 0
+
+
+def test_ledger_failure_keeps_the_reply_cached(gateway, monkeypatch, tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=10)
+
+    class BrokenLedger:
+        def record(self, *args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(llm_gateway, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_gateway, "get_usage_ledger", lambda: BrokenLedger())
+    models = gateway([])
+
+    assert llm_gateway.generate_text("prompt", "v1", repo="o/r") == "9"
+    assert llm_gateway.generate_text("prompt", "v1", repo="o/r") == "9"
+    assert models.calls == 1
@@ -32,3 +32,34 @@ def test_category_1_score():
     score = calculate_category_1_score(data)
     # Weighted sum approx 10
     assert score > 9
+
+def test_category_1_scores_batch_matches_scalar():
+    import random
+    from datetime import datetime, timedelta, timezone
+    from services.scoring.maintenance import calculate_category_1_scores_batch, maintenance_columns
+
+    rng = random.Random(7)
+    now = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+    rows = []
+    for _ in range(400):
+        pushed = now - timedelta(hours=rng.uniform(0, 3000))
+        rows.append({
+            "pushedAt": rng.choice([
+                pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                pushed.isoformat(),
+                pushed.strftime("%Y-%m-%d"),
+                "",
+                "not a date",
+            ]),
+            "commitCountLast90Days": rng.randint(0, 150),
+            "totalCommitCount": rng.randint(0, 3000),
+            "pullRequests": {"totalCount": rng.randint(0, 40), "merged": rng.randint(0, 40),
+                             "avgMergeTimeDays": rng.randint(0, 20)},
+            "issues": rng.choice([rng.randint(0, 30), {"totalCount": rng.randint(0, 40), "closed": rng.randint(0, 40)}]),
+            "ciPresent": rng.random() < 0.8,
+            "testCoveragePercent": rng.randint(0, 100),
+        })
+
+    batch = calculate_category_1_scores_batch(**maintenance_columns(rows), now=now)
+    expected = [calculate_category_1_score(row, now=now) for row in rows]
+    assert batch["maintenance_score"].tolist() == expected
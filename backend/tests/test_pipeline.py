@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from services.scoring import api, pipeline
+
+
+class _MissingRepo:
+    snapshot = None
+
+    def __init__(self, owner, name):
+        self.owner, self.name, self.full_name = owner, name, f"{owner}/{name}"
+        self.calls = []
+
+    def get_snapshot(self):
+        self.calls.append("snapshot")
+        return None
+
+    def __getattr__(self, attr):
+        if attr.startswith("get_"):
+            return lambda: self.calls.append(attr)
+        raise AttributeError(attr)
+
+
+def test_missing_repo_skips_every_other_fetch_and_scorer(monkeypatch):
+    monkeypatch.setattr(pipeline, "RepoContext", _MissingRepo)
+
+    ctx, scores, errors = pipeline.run_repo_scoring("o", "gone")
+
+    assert ctx.calls == ["snapshot"]
+    assert ctx.snapshot is None
+    assert scores == {component: 0 for component in pipeline.SCORE_STAGES}
+    assert isinstance(errors["snapshot"], pipeline.RepoNotFoundError)
+
+
+def _score(monkeypatch, errors):
+    saved = []
+    scores = {component: 5 for component in pipeline.SCORE_STAGES}
+    ctx = SimpleNamespace(snapshot={"pushedAt": "2026-10-01T00:00:00Z"}, snippets=[])
+    monkeypatch.setattr(api, "get_cached_score", lambda owner, repo: None)
+    monkeypatch.setattr(api, "save_score", lambda owner, repo, result: saved.append(result))
+    monkeypatch.setattr(api, "run_repo_scoring", lambda owner, repo: (ctx, scores, errors))
+    response = TestClient(api.app).post("/score", json={"owner": "o", "repo_name": "r"})
+    return response, saved
+
+
+def test_score_is_404_only_when_the_repo_does_not_exist(monkeypatch):
+    response, saved = _score(monkeypatch, {"snapshot": pipeline.RepoNotFoundError("gone")})
+    assert response.status_code == 404 and not saved
+
+    response, saved = _score(monkeypatch, {"snapshot": RuntimeError("GraphQL timeout")})
+    assert response.status_code == 502 and not saved
+
+    response, saved = _score(monkeypatch, {"maintenance_score": RuntimeError("bad snapshot")})
+    assert response.status_code == 502 and not saved
+
+
+def test_failed_components_are_reported_and_not_cached(monkeypatch):
+    response, saved = _score(monkeypatch, {"documentation_score": RuntimeError("Gemini down")})
+    assert response.status_code == 200
+    assert response.json()["failed_components"] == ["documentation_score"]
+    assert set(response.json()["component_inputs"]) == {"community_engagement_score", "code_quality_score"}
+    assert not saved
+
+    response, saved = _score(monkeypatch, {})
+    assert "failed_components" not in response.json()
+    assert len(saved) == 1
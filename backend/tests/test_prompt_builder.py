@@ -0,0 +1,53 @@
+from services.scoring.llm_usage import UsageLedger
+from services.scoring.prompt_builder import PromptBuilder, count_tokens, is_boilerplate
+
+
+def test_sections_are_budgeted_deduplicated_and_cleaned():
+    readme = "\n".join([
+        "[![Build](https://img.shields.io/badge/build-passing-green.svg)](https://ci)",
+        "Copyright (c) 2024 Example Corp",
+        "Install with pip install example",
+        "",
+    ] + [f"Step {i}: configure option number {i} in settings.toml" for i in range(200)])
+    builder = PromptBuilder("Score this README.\n")
+    used = builder.add_section("### setup", readme, budget=100, dedupe=True)
+    builder.add_section("### examples", "Install with pip install example\nRun example --demo", budget=100, dedupe=True)
+    prompt = builder.build()
+
+    assert used <= 100
+    assert "shields.io" not in prompt and "Copyright" not in prompt
+    assert prompt.count("Install with pip install example") == 1
+    assert "Run example --demo" in prompt
+    assert "Step 199" not in prompt
+    assert count_tokens(prompt) < 250
+    assert is_boilerplate("# SPDX-License-Identifier: MIT")
+    assert not is_boilerplate("def license_check():")
+
+
+def test_code_snippets_keep_repeated_lines():
+    from services.ingest.ecosyste_client import build_code_quality_prompt
+
+    code = "def a(x):\n    if x:\n        return None\n    return None\ndef b(y):\n    if y:\n        return None\n    return None"
+    prompt = build_code_quality_prompt("Score this code.", [
+        {"file_path": "a.py", "content": code},
+        {"file_path": "b.py", "content": code},
+    ])
+
+    assert prompt.count("        return None") == 4
+    assert prompt.count("    return None") == 8
+    assert prompt.count("def b(y):") == 2
+
+
+def test_usage_ledger_accumulates_per_repo(tmp_path):
+    ledger = UsageLedger(str(tmp_path / "usage.db"))
+    ledger.record("o/r", "code-quality-1", prompt_tokens=900, output_tokens=2)
+    ledger.record("o/r", "code-quality-1", cache_hit=True)
+    ledger.record("o/r", "doc-structured-1", prompt_tokens=500, output_tokens=20)
+    ledger.record("o/other", "code-quality-1", prompt_tokens=100, output_tokens=1)
+
+    usage = ledger.for_repo("o/r")
+    assert usage["prompt_tokens"] == 1400
+    assert usage["templates"]["code-quality-1"] == {
+        "requests": 1, "cache_hits": 1, "prompt_tokens": 900, "output_tokens": 2,
+    }
+    assert ledger.totals()["repos"] == 2
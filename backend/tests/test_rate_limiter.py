@@ -0,0 +1,26 @@
+import time
+
+from services.ingest.rate_limiter import RateLimitScheduler, resource_for_url
+
+
+def test_resource_for_url():
+    assert resource_for_url("https://api.github.com/graphql") == "graphql"
+    assert resource_for_url("https://api.github.com/search/repositories") == "search"
+    assert resource_for_url("https://api.github.com/repos/octocat/Hello-World") == "core"
+
+
+def test_exhausted_token_is_skipped_until_reset():
+    scheduler = RateLimitScheduler(["a", "b"])
+    scheduler.record("a", "core", {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Reset": str(time.time() + 600),
+    })
+    assert scheduler.acquire("core") == "b"
+    assert scheduler.acquire("search") in ("a", "b")
+
+
+def test_403_with_retry_after_is_rate_limited():
+    assert RateLimitScheduler.is_rate_limited(403, {"Retry-After": "30"})
+    assert RateLimitScheduler.is_rate_limited(429, {})
+    assert not RateLimitScheduler.is_rate_limited(403, {"X-RateLimit-Remaining": "12"}, "Must have admin rights")
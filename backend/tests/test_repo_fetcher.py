@@ -0,0 +1,84 @@
+import pytest
+import requests
+
+from services.ingest import repo_fetcher
+from services.ingest.repo_fetcher import fetch_repo_data_batch
+
+
+def _node(owner, name, pushed_at="2026-10-01T00:00:00Z"):
+    return {"name": name, "owner": {"login": owner}, "pushedAt": pushed_at, "stargazerCount": 3}
+
+
+def _aliases(variables):
+    count = sum(1 for key in variables if key.startswith("o"))
+    return [(f"r{i}", variables[f"o{i}"], variables[f"n{i}"]) for i in range(count)]
+
+
+def test_batch_maps_aliases_and_keeps_resolved_repos_on_per_alias_errors(monkeypatch):
+    def graphql(query, variables):
+        data, errors = {}, []
+        for alias, owner, name in _aliases(variables):
+            if name == "gone":
+                data[alias] = None
+                errors.append({"path": [alias], "message": "Could not resolve to a Repository"})
+            else:
+                data[alias] = _node(owner, name)
+        return data, errors
+
+    monkeypatch.setattr(repo_fetcher, "run_graphql_query_partial", graphql)
+    results = fetch_repo_data_batch([("a", "one"), ("b", "gone"), ("c", "three")], batch_size=5)
+
+    assert results["a/one"]["full_name"] == "a/one"
+    assert results["c/three"]["stars"] == 3
+    assert results["b/gone"] is None
+
+
+def test_batch_splits_chunks_rejected_by_pathless_errors(monkeypatch):
+    sizes = []
+
+    def graphql(query, variables):
+        aliases = _aliases(variables)
+        sizes.append(len(aliases))
+        if len(aliases) > 1:
+            return {}, [{"message": "Query has too many nodes"}]
+        if aliases[0][2] == "broken":
+            raise RuntimeError("timeout")
+        return {alias: _node(owner, name) for alias, owner, name in aliases}, []
+
+    monkeypatch.setattr(repo_fetcher, "run_graphql_query_partial", graphql)
+    results = fetch_repo_data_batch([("a", "one"), ("b", "two"), ("c", "broken")], batch_size=3)
+
+    assert sizes == [3, 1, 2, 1, 1]
+    assert results["a/one"] and results["b/two"]
+    assert results["c/broken"] is None
+
+
+def test_batch_falls_back_to_rest_for_missing_pushed_at(monkeypatch):
+    class _Rest:
+        ok = True
+
+        def json(self):
+            return {"pushed_at": "2026-09-30T12:00:00Z"}
+
+    calls = []
+    monkeypatch.setattr(
+        repo_fetcher, "run_graphql_query_partial",
+        lambda q, v: ({alias: _node(o, n, pushed_at=None) for alias, o, n in _aliases(v)}, []),
+    )
+    monkeypatch.setattr(repo_fetcher, "github_get", lambda url: calls.append(url) or _Rest())
+
+    results = fetch_repo_data_batch([("a", "one")])
+
+    assert calls == ["/repos/a/one"]
+    assert results["a/one"]["pushedAt"] == "2026-09-30T12:00:00Z"
+
+
+def test_single_snapshot_is_none_only_for_missing_repos(monkeypatch):
+    not_found = [{"type": "NOT_FOUND", "path": ["repository"], "message": "Could not resolve"}]
+    monkeypatch.setattr(repo_fetcher, "run_graphql_query_partial", lambda q, v: ({"repository": None}, not_found))
+    assert repo_fetcher.fetch_repo_data("o", "gone") is None
+
+    timeout = [{"message": "Timeout on validation of query"}]
+    monkeypatch.setattr(repo_fetcher, "run_graphql_query_partial", lambda q, v: ({}, timeout))
+    with pytest.raises(requests.exceptions.HTTPError):
+        repo_fetcher.fetch_repo_data("o", "r")
@@ -0,0 +1,101 @@
+import asyncio
+import json
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from services.scoring import api, config, enhanced_scoring
+
+
+def test_stream_emits_repo_patch_then_ranking(monkeypatch):
+    def fake_batch(repos, on_event=None, cancelled=None):
+        on_event("repo", {"repo": "o/r", "combined_score": 5.0})
+        on_event("patch", {"repo": "o/r", "documentation_score": 8, "combined_score": 6.1})
+        ranking = [{"repo": "o/r", "combined_score": 6.1}]
+        on_event("ranking", ranking)
+        return ranking
+
+    monkeypatch.setattr(api, "_run_search", lambda filters: [{"owner": "o", "name": "r"}])
+    monkeypatch.setattr(api, "batch_score_repositories", fake_batch)
+
+    response = TestClient(api.app).post("/search_and_score/stream", json={})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["event"] for line in lines] == ["repo", "patch", "ranking"]
+    assert lines[-1]["data"] == [{"repo": "o/r", "combined_score": 6.1}]
+
+
+def test_cancelled_batch_skips_remaining_repos(monkeypatch):
+    cancelled = threading.Event()
+    scored = []
+
+    def fake_basics(idx, total, repo, snapshot, maintenance_score=None):
+        scored.append(repo["name"])
+        cancelled.set()
+        return None
+
+    monkeypatch.setattr(enhanced_scoring.config, "BATCH_BASIC_WORKERS", 1)
+    monkeypatch.setattr(enhanced_scoring, "fetch_repo_data_batch", lambda repos: {})
+    monkeypatch.setattr(enhanced_scoring, "_score_basics", fake_basics)
+    events = []
+
+    repos = [{"owner": "o", "name": f"r{i}", "full_name": f"o/r{i}"} for i in range(5)]
+    result = enhanced_scoring.batch_score_repositories(repos, on_event=lambda e, d: events.append(e), cancelled=cancelled)
+
+    assert scored == ["r0"]
+    assert result == []
+    assert "ranking" not in events
+
+
+def test_stream_cancels_batch_when_client_disconnects(monkeypatch):
+    repos = [{"owner": "o", "name": f"r{i}"} for i in range(50)]
+    scored = []
+    seen_cancelled = threading.Event()
+    batch_done = threading.Event()
+
+    def fake_batch(repos, on_event=None, cancelled=None):
+        try:
+            for repo in repos:
+                if cancelled.is_set():
+                    seen_cancelled.set()
+                    return []
+                scored.append(repo["name"])
+                if len(scored) == 1:
+                    on_event("repo", {"repo": repo["name"]})
+                time.sleep(0.02)
+            return []
+        finally:
+            batch_done.set()
+
+    monkeypatch.setattr(api, "_run_search", lambda filters: repos)
+    monkeypatch.setattr(api, "batch_score_repositories", fake_batch)
+    monkeypatch.setattr(config, "STREAM_DISCONNECT_POLL_SECONDS", 0.05)
+
+    sent = []
+
+    async def receive():
+        # Body first; once a line has been streamed the client is gone. Never suspends, so
+        # Request.is_disconnected sees the message (ASGI 2.4 servers leave polling to the app).
+        if not sent:
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            sent.append(message["body"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/search_and_score/stream", "raw_path": b"/search_and_score/stream",
+        "query_string": b"", "root_path": "", "headers": [(b"content-type", b"application/json")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(asyncio.wait_for(api.app(scope, receive, send), timeout=10))
+
+    assert batch_done.wait(5)
+    assert seen_cancelled.is_set()
+    assert len(scored) < len(repos)
+    assert [json.loads(line)["event"] for line in sent] == ["repo"]
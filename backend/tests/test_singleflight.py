@@ -0,0 +1,26 @@
+import threading
+import time
+
+from services.scoring.singleflight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", compute))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [42] * 5
+    assert len(calls) == 1
+    assert flight.do("k", compute) == 42
+    assert len(calls) == 2
@@ -0,0 +1,32 @@
+import threading
+import time
+
+from services.scoring.stage_graph import Stage, StageGraph
+
+
+def test_independent_stages_run_concurrently_and_failures_propagate():
+    started = threading.Barrier(2, timeout=1)
+
+    def fetch(value):
+        def run():
+            started.wait()
+            return value
+        return run
+
+    def boom():
+        raise RuntimeError("fetch failed")
+
+    graph = StageGraph([
+        Stage("a", fetch(1)),
+        Stage("b", fetch(2)),
+        Stage("bad", boom),
+        Stage("sum", lambda a, b: a + b, ("a", "b")),
+        Stage("downstream", lambda bad: bad, ("bad",)),
+    ])
+    start = time.monotonic()
+    results, errors = graph.run(max_workers=4)
+
+    assert time.monotonic() - start < 1
+    assert results == {"a": 1, "b": 2, "sum": 3}
+    assert isinstance(errors["bad"], RuntimeError)
+    assert errors["downstream"] is errors["bad"]
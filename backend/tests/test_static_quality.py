@@ -0,0 +1,53 @@
+import base64
+
+from services.ingest.repo_fetcher import build_snippet
+from services.scoring.static_quality import analyze_snippet, estimate_code_quality
+
+CLEAN_PY = '''
+# Helpers for parsing config files.
+def load(path):
+    """Read a config file into a dict."""
+    with open(path) as f:
+        return parse(f.read())
+
+
+def parse(text):
+    result = {}
+    for line in text.splitlines():
+        key, _, value = line.partition("=")
+        result[key.strip()] = value.strip()
+    return result
+'''
+
+NESTED_JS = "\n".join(
+    ["function handle(req) {"]
+    + ["  " * depth + "if (req.a" + str(depth) + ") {" for depth in range(1, 8)]
+    + ["  " * 8 + "doSomethingVeryRepetitive(req.payload, req.headers, req.options);"] * 6
+    + ["  " * depth + "}" for depth in range(7, 0, -1)]
+    + ["}"]
+)
+
+
+def test_clean_code_outscores_deeply_nested_duplicated_code():
+    clean = estimate_code_quality([{"file_path": "config.py", "content": CLEAN_PY}])
+    messy = estimate_code_quality([{"file_path": "handler.js", "content": NESTED_JS}])
+
+    assert analyze_snippet({"file_path": "config.py", "content": CLEAN_PY})["parsed"]
+    assert messy["metrics"]["max_nesting"] >= 8
+    assert messy["metrics"]["duplication_ratio"] > 0.3
+    assert 0 <= messy["score"] < clean["score"] <= 10
+
+
+def test_no_code_gives_no_estimate():
+    assert estimate_code_quality([]) == {"score": None, "confidence": 0.0, "metrics": {}}
+
+
+def test_fetched_snippet_is_analyzed_from_the_whole_file():
+    encoded = base64.b64encode(CLEAN_PY.encode()).decode()
+    snippet = build_snippet({"path": "config.py", "sha": "abc"}, {"content": encoded})
+
+    # The LLM excerpt hoists comments above truncated code and does not parse on its own
+    assert not analyze_snippet({"file_path": "config.py", "content": snippet["content"]})["parsed"]
+    analysis = analyze_snippet(snippet)
+    assert analysis["parsed"]
+    assert analysis["max_function_length"] == 6